@@ -11,6 +11,16 @@ from typing import List, Dict
 from sochdb import Database
 
 
+# Per-message fields. Each is stored under its own prefix,
+# threads.{thread_id}.{field}.{msg_idx}, so single-field readers
+# (e.g. search) scan one key per message.
+MESSAGE_FIELDS = ("role", "name", "content", "metadata", "timestamp")
+
+# Key-prefix constants
+USERS_P = b"users."
+THREADS_P = b"threads."
+
+
 # Conversation history (same as Zep example)
 SHOE_PURCHASE_HISTORY = [
     {
@@ -157,20 +167,37 @@ class SochDBChatHistory:
     Chat history manager using SochDB
     
     Stores conversation messages with full context retrieval
+
+    Key layout:
+        threads.{thread_id}.user_id / created_at    thread metadata
+        threads.{thread_id}.message_count           number of messages
+        threads.{thread_id}.{field}.{msg_idx}       one key per message field
+        threads.{thread_id}.content_lc.{msg_idx}    lowercased content for search
     """
     
     def __init__(self, db_path="./sochdb_chat_data"):
         self.db = Database.open(db_path)
+        # thread_id -> b"threads.{thread_id}." (encoded once per thread)
+        self._thread_prefixes: Dict[str, bytes] = {}
+    
+    def _thread_prefix(self, thread_id) -> bytes:
+        """Cached b"threads.{thread_id}." prefix"""
+        prefix = self._thread_prefixes.get(thread_id)
+        if prefix is None:
+            prefix = THREADS_P + thread_id.encode() + b"."
+            self._thread_prefixes[thread_id] = prefix
+        return prefix
     
     def create_user(self, user_id=None, first_name=None, last_name=None, email=None):
         """Create a user"""
         if user_id is None:
             user_id = uuid.uuid4().hex
         
-        self.db.put(f"users.{user_id}.first_name".encode(), (first_name or "").encode())
-        self.db.put(f"users.{user_id}.last_name".encode(), (last_name or "").encode())
-        self.db.put(f"users.{user_id}.email".encode(), (email or "").encode())
-        self.db.put(f"users.{user_id}.created_at".encode(), str(time.time()).encode())
+        prefix = USERS_P + user_id.encode() + b"."
+        self.db.put(prefix + b"first_name", (first_name or "").encode())
+        self.db.put(prefix + b"last_name", (last_name or "").encode())
+        self.db.put(prefix + b"email", (email or "").encode())
+        self.db.put(prefix + b"created_at", str(time.time()).encode())
         
         return user_id
     
@@ -179,66 +206,100 @@ class SochDBChatHistory:
         if thread_id is None:
             thread_id = uuid.uuid4().hex
         
+        prefix = self._thread_prefix(thread_id)
+        
         if user_id:
-            self.db.put(f"threads.{thread_id}.user_id".encode(), user_id.encode())
+            self.db.put(prefix + b"user_id", user_id.encode())
         
-        self.db.put(f"threads.{thread_id}.created_at".encode(), str(time.time()).encode())
+        self.db.put(prefix + b"created_at", str(time.time()).encode())
         
         return thread_id
     
     def add_message(self, thread_id, message: Dict):
         """Add a single message to thread"""
-        # Get current message count
-        msg_count = 0
-        for key, _ in self.db.scan_prefix(f"threads.{thread_id}.messages.".encode()):
-            key_str = key.decode()
-            if ".content" in key_str:
-                msg_count += 1
-        
-        msg_idx = msg_count + 1
-        prefix = f"threads.{thread_id}.messages.{msg_idx}"
+        msg_idx = self._message_count(thread_id) + 1
         
-        self.db.put(f"{prefix}.role".encode(), message["role"].encode())
-        self.db.put(f"{prefix}.name".encode(), message["name"].encode())
-        self.db.put(f"{prefix}.content".encode(), message["content"].encode())
+        self.db.put(self._field_key(thread_id, "role", msg_idx), message["role"].encode())
+        self.db.put(self._field_key(thread_id, "name", msg_idx), message["name"].encode())
+        self.db.put(self._field_key(thread_id, "content", msg_idx), message["content"].encode())
+        # Lowercased copy so search_thread never lowercases stored content
+        self.db.put(self._field_key(thread_id, "content_lc", msg_idx),
+                   message["content"].lower().encode())
         
         # Store metadata if present
         if "metadata" in message:
-            self.db.put(f"{prefix}.metadata".encode(), 
+            self.db.put(self._field_key(thread_id, "metadata", msg_idx),
                        json.dumps(message["metadata"]).encode())
         
-        self.db.put(f"{prefix}.timestamp".encode(), str(time.time()).encode())
+        self.db.put(self._field_key(thread_id, "timestamp", msg_idx), str(time.time()).encode())
+        self.db.put(self._thread_prefix(thread_id) + b"message_count", str(msg_idx).encode())
     
     def add_messages(self, thread_id, messages: List[Dict]):
         """Add multiple messages to thread"""
         for msg in messages:
             self.add_message(thread_id, msg)
     
+    def _message_count(self, thread_id) -> int:
+        """Number of messages in a thread (threads.{thread_id}.message_count)"""
+        value = self.db.get(self._thread_prefix(thread_id) + b"message_count")
+        return int(value) if value else 0
+    
+    def _field_key(self, thread_id, field, msg_idx) -> bytes:
+        """
+        Key for one field of one message: threads.{thread_id}.{field}.{msg_idx}
+        
+        msg_idx is zero-padded so scan_prefix yields messages in numeric order.
+        """
+        return self._thread_prefix(thread_id) + f"{field}.{msg_idx:010d}".encode()
+    
+    def iter_field(self, thread_id, field, decode=True):
+        """
+        Yield (msg_idx, value) for a single message field (raw bytes if not decode)
+        
+        Only scans threads.{thread_id}.{field}., so callers that need one
+        field (e.g. search) iterate one key per message instead of all of them.
+        """
+        prefix = self._thread_prefix(thread_id) + field.encode() + b"."
+        for key, value in self.db.scan_prefix(prefix):
+            yield int(key[len(prefix):]), value.decode() if decode else value
+    
     def get_thread_messages(self, thread_id) -> List[Dict]:
-        """Retrieve all messages from a thread"""
-        messages = {}
+        """
+        Retrieve all messages from a thread
         
-        for key, value in self.db.scan_prefix(f"threads.{thread_id}.messages.".encode()):
-            key_str = key.decode()
-            parts = key_str.split(".")
-            
-            if len(parts) >= 5:
-                msg_idx = parts[3]
-                field = parts[4]
-                
-                if msg_idx not in messages:
-                    messages[msg_idx] = {}
+        The stored message count gives the exact key set, so every field of
+        every message is fetched with a single get_batch call.
+        """
+        return self._get_messages(thread_id, range(1, self._message_count(thread_id) + 1))
+    
+    def _get_messages(self, thread_id, msg_idxs) -> List[Dict]:
+        """Every field of the given messages, in order, with one get_batch call"""
+        keys = [
+            self._field_key(thread_id, field, msg_idx)
+            for msg_idx in msg_idxs
+            for field in MESSAGE_FIELDS
+        ]
+        if not keys:
+            return []
+        values = self.db.get_batch(keys)
+        
+        messages = []
+        stride = len(MESSAGE_FIELDS)
+        for offset in range(0, len(values), stride):
+            message = {}
+            for field, value in zip(MESSAGE_FIELDS, values[offset:offset + stride]):
+                if value is None:
+                    continue
                 
                 value_str = value.decode()
                 
                 if field == "metadata":
-                    messages[msg_idx][field] = json.loads(value_str)
+                    message[field] = json.loads(value_str)
                 else:
-                    messages[msg_idx][field] = value_str
+                    message[field] = value_str
+            messages.append(message)
         
-        # Sort by index and return as list
-        sorted_messages = [messages[k] for k in sorted(messages.keys(), key=int)]
-        return sorted_messages
+        return messages
     
     def get_user_context(self, thread_id) -> str:
         """
@@ -289,20 +350,21 @@ class SochDBChatHistory:
         """
         Simple keyword search through thread messages
         
+        Scans the pre-lowercased content_lc field as bytes (in message order);
+        the full messages are fetched only for the first `limit` matches.
         In production, use embeddings for semantic search
         """
-        messages = self.get_thread_messages(thread_id)
-        
         # Simple keyword matching
-        results = []
-        query_lower = query.lower()
+        matches = []
+        query_lower = query.lower().encode()
         
-        for msg in messages:
-            content = msg.get("content", "").lower()
-            if query_lower in content:
-                results.append(msg)
+        for msg_idx, content_lc in self.iter_field(thread_id, "content_lc", decode=False):
+            if query_lower in content_lc:
+                matches.append(msg_idx)
+                if len(matches) >= limit:
+                    break
         
-        return results[:limit]
+        return self._get_messages(thread_id, matches)
     
     def close(self):
         """Close database"""
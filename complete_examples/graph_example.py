@@ -7,9 +7,23 @@ Equivalent to Zep's graph_example/graph_example.py
 import uuid
 import json
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from sochdb import Database
 
+try:
+    import ahocorasick  # optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# Key-prefix constants
+GRAPHS_P = b"graphs."
+EPISODES_P = b"episodes."
+NODES_P = b"nodes."
+EDGES_P = b"edges."
+EPISODE_NODES_P = b"episode_nodes."
+NODE_EDGES_P = b"node_edges."
+
 
 class SochDBGraph:
     """
@@ -23,31 +37,61 @@ class SochDBGraph:
     
     def __init__(self, db_path="./sochdb_graph_data"):
         self.db = Database.open(db_path)
+        # graph_id -> {"graph"|"episodes"|"nodes"|"edges": b"<kind>.{graph_id}."}
+        self._graph_prefixes: Dict[str, Dict[str, bytes]] = {}
+    
+    def _prefixes(self, graph_id) -> Dict[str, bytes]:
+        """Per-graph key prefixes, encoded once and reused by every scan/put"""
+        prefixes = self._graph_prefixes.get(graph_id)
+        if prefixes is None:
+            gid = graph_id.encode() + b"."
+            prefixes = {
+                "graph": GRAPHS_P + gid,
+                "episodes": EPISODES_P + gid,
+                "nodes": NODES_P + gid,
+                "edges": EDGES_P + gid,
+            }
+            self._graph_prefixes[graph_id] = prefixes
+        return prefixes
     
     def create_graph(self, graph_id, name=None, description=None):
         """Create a graph"""
-        self.db.put(f"graphs.{graph_id}.name".encode(), (name or "").encode())
-        self.db.put(f"graphs.{graph_id}.description".encode(), (description or "").encode())
-        self.db.put(f"graphs.{graph_id}.created_at".encode(), str(time.time()).encode())
+        prefix = self._prefixes(graph_id)["graph"]
+        self.db.put(prefix + b"name", (name or "").encode())
+        self.db.put(prefix + b"description", (description or "").encode())
+        self.db.put(prefix + b"created_at", str(time.time()).encode())
         
         return {"graph_id": graph_id, "name": name, "description": description}
     
-    def add_episode(self, graph_id, data, episode_type="text"):
+    def add_episode(self, graph_id, data: Union[str, Dict], episode_type="text"):
         """
         Add an episode (data point) to the graph
         
-        Episodes are raw input that can be processed into nodes/edges
+        Episodes are raw input that can be processed into nodes/edges.
+        A dict is stored as a JSON episode and extracted without re-parsing.
         """
         episode_id = uuid.uuid4().hex
         
-        self.db.put(f"episodes.{graph_id}.{episode_id}.data".encode(), data.encode())
-        self.db.put(f"episodes.{graph_id}.{episode_id}.type".encode(), episode_type.encode())
-        self.db.put(f"episodes.{graph_id}.{episode_id}.created_at".encode(), 
-                   str(time.time()).encode())
+        parsed = None
+        if isinstance(data, dict):
+            parsed = data
+            data = json.dumps(data)
+            episode_type = "json"
+        
+        prefix = self._prefixes(graph_id)["episodes"] + episode_id.encode() + b"."
+        self.db.put(prefix + b"data", data.encode())
+        self.db.put(prefix + b"type", episode_type.encode())
+        self.db.put(prefix + b"created_at", str(time.time()).encode())
         
         # Extract entities if JSON
         if episode_type == "json":
-            self._extract_from_json(graph_id, episode_id, data)
+            if parsed is None:
+                try:
+                    parsed = json.loads(data)
+                except json.JSONDecodeError as e:
+                    print(f"  ⚠ Episode {episode_id}: invalid JSON, skipping extraction ({e})")
+            if isinstance(parsed, dict):
+                self._extract_from_json(graph_id, episode_id, parsed)
         else:
             self._extract_from_text(graph_id, episode_id, data)
         
@@ -65,27 +109,23 @@ class SochDBGraph:
             node_id = self._create_node(graph_id, entity, "Person")
             
             # Link episode to node
-            self.db.put(f"episode_nodes.{episode_id}.{node_id}".encode(), b"mentions")
+            self.db.put(EPISODE_NODES_P + f"{episode_id}.{node_id}".encode(), b"mentions")
     
-    def _extract_from_json(self, graph_id, episode_id, json_str):
-        """Extract entities from JSON data"""
-        try:
-            data = json.loads(json_str)
-            
-            # Extract as nodes
-            for key, value in data.items():
-                if isinstance(value, str):
-                    node_id = self._create_node(graph_id, value, key.title())
-                    self.db.put(f"episode_nodes.{episode_id}.{node_id}".encode(), 
-                               key.encode())
-        except:
-            pass
+    def _extract_from_json(self, graph_id, episode_id, data: Dict):
+        """Extract entities from already-parsed JSON data"""
+        # Extract as nodes
+        for key, value in data.items():
+            if isinstance(value, str):
+                node_id = self._create_node(graph_id, value, key.title())
+                self.db.put(EPISODE_NODES_P + f"{episode_id}.{node_id}".encode(),
+                           key.encode())
     
     def _create_node(self, graph_id, name, node_type):
         """Create or get existing node"""
         # Check if node exists
+        nodes_p = self._prefixes(graph_id)["nodes"]
         node_id = None
-        for key, value in self.db.scan_prefix(f"nodes.{graph_id}.".encode()):
+        for key, value in self.db.scan_prefix(nodes_p):
             key_str = key.decode()
             if ".name" in key_str and value.decode() == name:
                 node_id = key_str.split(".")[2]
@@ -93,10 +133,10 @@ class SochDBGraph:
         
         if not node_id:
             node_id = uuid.uuid4().hex[:8]
-            self.db.put(f"nodes.{graph_id}.{node_id}.name".encode(), name.encode())
-            self.db.put(f"nodes.{graph_id}.{node_id}.type".encode(), node_type.encode())
-            self.db.put(f"nodes.{graph_id}.{node_id}.created_at".encode(), 
-                       str(time.time()).encode())
+            prefix = nodes_p + node_id.encode() + b"."
+            self.db.put(prefix + b"name", name.encode())
+            self.db.put(prefix + b"type", node_type.encode())
+            self.db.put(prefix + b"created_at", str(time.time()).encode())
         
         return node_id
     
@@ -104,17 +144,17 @@ class SochDBGraph:
         """Create an edge (relationship) between two nodes"""
         edge_id = uuid.uuid4().hex[:8]
         
-        self.db.put(f"edges.{graph_id}.{edge_id}.source".encode(), source_node.encode())
-        self.db.put(f"edges.{graph_id}.{edge_id}.target".encode(), target_node.encode())
-        self.db.put(f"edges.{graph_id}.{edge_id}.type".encode(), edge_type.encode())
+        prefix = self._prefixes(graph_id)["edges"] + edge_id.encode() + b"."
+        self.db.put(prefix + b"source", source_node.encode())
+        self.db.put(prefix + b"target", target_node.encode())
+        self.db.put(prefix + b"type", edge_type.encode())
         
         if properties:
-            self.db.put(f"edges.{graph_id}.{edge_id}.properties".encode(),
-                       json.dumps(properties).encode())
+            self.db.put(prefix + b"properties", json.dumps(properties).encode())
         
         # Create indexes for graph traversal
-        self.db.put(f"node_edges.{source_node}.out.{edge_id}".encode(), target_node.encode())
-        self.db.put(f"node_edges.{target_node}.in.{edge_id}".encode(), source_node.encode())
+        self.db.put(NODE_EDGES_P + f"{source_node}.out.{edge_id}".encode(), target_node.encode())
+        self.db.put(NODE_EDGES_P + f"{target_node}.in.{edge_id}".encode(), source_node.encode())
         
         return edge_id
     
@@ -122,7 +162,7 @@ class SochDBGraph:
         """Get episodes from a graph"""
         episodes = {}
         
-        for key, value in self.db.scan_prefix(f"episodes.{graph_id}.".encode()):
+        for key, value in self.db.scan_prefix(self._prefixes(graph_id)["episodes"]):
             key_str = key.decode()
             parts = key_str.split(".")
             
@@ -149,7 +189,7 @@ class SochDBGraph:
         """Get all nodes from a graph"""
         nodes = {}
         
-        for key, value in self.db.scan_prefix(f"nodes.{graph_id}.".encode()):
+        for key, value in self.db.scan_prefix(self._prefixes(graph_id)["nodes"]):
             key_str = key.decode()
             parts = key_str.split(".")
             
@@ -168,7 +208,7 @@ class SochDBGraph:
         """Get all edges from a graph"""
         edges = {}
         
-        for key, value in self.db.scan_prefix(f"edges.{graph_id}.".encode()):
+        for key, value in self.db.scan_prefix(self._prefixes(graph_id)["edges"]):
             key_str = key.decode()
             parts = key_str.split(".")
             
@@ -188,36 +228,72 @@ class SochDBGraph:
         
         return list(edges.values())
     
-    def search(self, graph_id, query) -> List[Dict]:
-        """Search episodes and nodes for query"""
-        results = []
-        query_lower = query.lower()
+    def _compile_queries(self, queries: List[str]):
+        """
+        Build a matcher: lowercased text -> set of queries it contains
+        
+        Uses a pyahocorasick automaton when available so a record is scanned
+        once no matter how many queries there are.
+        """
+        by_lower: Dict[str, List[str]] = {}
+        for q in queries:
+            by_lower.setdefault(q.lower(), []).append(q)
+        
+        if ahocorasick is None or "" in by_lower:
+            def match(text):
+                hits = set()
+                for q_lower, originals in by_lower.items():
+                    if q_lower in text:
+                        hits.update(originals)
+                return hits
+            return match
+        
+        automaton = ahocorasick.Automaton()
+        for q_lower, originals in by_lower.items():
+            automaton.add_word(q_lower, originals)
+        automaton.make_automaton()
+        
+        def match(text):
+            hits = set()
+            for _, originals in automaton.iter(text):
+                hits.update(originals)
+            return hits
+        return match
+    
+    def search_many(self, graph_id, queries: List[str]) -> Dict[str, List[Dict]]:
+        """Search episodes and nodes for several queries in one pass"""
+        match = self._compile_queries(queries)
+        results = {q: [] for q in queries}
         
         # Search episodes
-        episodes = self.get_episodes(graph_id)
-        for episode in episodes:
-            if query_lower in episode.get("data", "").lower():
-                results.append({
+        for episode in self.get_episodes(graph_id):
+            data = episode.get("data", "")
+            for q in match(data.lower()):
+                results[q].append({
                     "type": "episode",
                     "id": episode["uuid_"],
-                    "data": episode.get("data", ""),
+                    "data": data,
                     "match_type": "episode_content"
                 })
         
         # Search nodes
-        nodes = self.get_nodes(graph_id)
-        for node in nodes:
-            if query_lower in node.get("name", "").lower():
-                results.append({
+        for node in self.get_nodes(graph_id):
+            name = node.get("name", "")
+            for q in match(name.lower()):
+                results[q].append({
                     "type": "node",
                     "id": node["node_id"],
-                    "name": node.get("name", ""),
+                    "name": name,
                     "node_type": node.get("type", ""),
                     "match_type": "node_name"
                 })
         
         return results
     
+    def search(self, graph_id, query) -> List[Dict]:
+        """Search episodes and nodes for query"""
+        return self.search_many(graph_id, [query])[query]
+    
     def close(self):
         """Close database"""
         self.db.close()
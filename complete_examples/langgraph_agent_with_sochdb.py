@@ -6,7 +6,7 @@ A complete, working example showing how to integrate SochDB as the memory layer
 for a LangGraph agent with tools, state management, and persistent conversation history.
 
 Requirements:
-    pip install langgraph langchain-core langchain-openai sochdb-client python-dotenv
+    pip install langgraph langchain-core langchain-openai sochdb-client python-dotenv msgpack
 
 Usage:
     python3 langgraph_agent_with_sochdb.py
@@ -19,12 +19,14 @@ Features:
     - Multi-turn conversation with memory
 """
 
+import functools
 import os
+import re
 import uuid
-import json
 import time
-from typing import Annotated, List, Optional
+from typing import Annotated, Dict, List, Optional
 from typing_extensions import TypedDict
+import msgpack
 from dotenv import load_dotenv
 
 # LangGraph and LangChain imports
@@ -41,6 +43,14 @@ from sochdb import Database
 # Load environment
 load_dotenv()
 
+# Tokenizer for the per-session inverted index
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> set:
+    """Lowercased word tokens of text"""
+    return set(_TOKEN_RE.findall(text.lower()))
+
 
 class SochDBMemoryStore:
     """
@@ -48,23 +58,57 @@ class SochDBMemoryStore:
     
     Stores conversation history with session isolation and provides
     search capabilities for retrieving relevant past context.
+    
+    Key layout:
+        sessions.{id}.msg_count            number of messages
+        sessions.{id}.messages.{idx:010d}  msgpack message record
+        sessions.{id}.index.{term}         posting list: comma-separated idx
+    
+    Message indices are zero-padded so key order equals message order.
+    A message record is the fixed tuple (role, content, timestamp, tool_calls)
+    where tool_calls is None or a list of (name, args, id) tuples.
     """
     
     def __init__(self, db_path: str = "./sochdb_langgraph_agent_data"):
         self.db = Database.open(db_path)
-    
-    def save_message(self, session_id: str, message: BaseMessage):
-        """Save a message to SochDB"""
-        # Count existing messages to get next index
-        msg_count = 0
-        prefix = f"sessions.{session_id}.messages."
-        for key, _ in self.db.scan_prefix(prefix.encode()):
-            if ".content" in key.decode():
-                msg_count += 1
+        # session_id -> last message index, mirrors sessions.{id}.msg_count
+        self._msg_counts: Dict[str, int] = {}
+        # session_id -> b"sessions.{id}." (encoded once per session)
+        self._prefix_cache: Dict[str, bytes] = {}
+    
+    def _session_prefix(self, session_id: str) -> bytes:
+        """Cached b"sessions.{id}." prefix"""
+        prefix = self._prefix_cache.get(session_id)
+        if prefix is None:
+            prefix = f"sessions.{session_id}.".encode()
+            self._prefix_cache[session_id] = prefix
+        return prefix
+    
+    def _message_key(self, session_id: str, msg_idx: int) -> bytes:
+        """Key of one message record"""
+        return self._session_prefix(session_id) + b"messages.%010d" % msg_idx
+    
+    def _next_index(self, txn, session_id: str) -> int:
+        """
+        Reserve the next message index for a session within txn
         
-        msg_idx = msg_count + 1
-        path = f"sessions.{session_id}.messages.{msg_idx}"
+        Reads and bumps the sessions.{id}.msg_count counter instead of
+        scanning every stored message; the value is cached per session so
+        hot paths skip even the single get.
+        """
+        count_key = self._session_prefix(session_id) + b"msg_count"
         
+        msg_count = self._msg_counts.get(session_id)
+        if msg_count is None:
+            value = txn.get(count_key)
+            msg_count = int(value) if value else 0
+        
+        msg_idx = msg_count + 1
+        txn.put(count_key, str(msg_idx).encode())
+        return msg_idx
+    
+    def save_message(self, session_id: str, message: BaseMessage):
+        """Save a message to SochDB as a single msgpack record"""
         # Determine role
         if isinstance(message, HumanMessage):
             role = "human"
@@ -75,50 +119,58 @@ class SochDBMemoryStore:
         else:
             role = "unknown"
         
-        # Store message data
-        self.db.put(f"{path}.role".encode(), role.encode())
-        self.db.put(f"{path}.content".encode(), str(message.content).encode())
-        self.db.put(f"{path}.timestamp".encode(), str(time.time()).encode())
+        content = str(message.content)
         
         # Store tool calls if present
-        if hasattr(message, 'tool_calls') and message.tool_calls:
-            self.db.put(
-                f"{path}.tool_calls".encode(),
-                json.dumps([{
-                    'name': tc.get('name'),
-                    'args': tc.get('args'),
-                    'id': tc.get('id')
-                } for tc in message.tool_calls]).encode()
-            )
+        tool_calls = None
+        if getattr(message, 'tool_calls', None):
+            tool_calls = [(tc.get('name'), tc.get('args'), tc.get('id')) for tc in message.tool_calls]
+        
+        record = msgpack.packb((role, content, time.time(), tool_calls))
+        
+        # Counter bump and message write commit together
+        with self.db.transaction() as txn:
+            msg_idx = self._next_index(txn, session_id)
+            txn.put(self._message_key(session_id, msg_idx), record)
+            
+            # One posting key per (term, message): index.{term}.{msg_idx:010d},
+            # so a write only appends and never rewrites a growing list
+            index_prefix = self._session_prefix(session_id) + b"index."
+            posting_suffix = b".%010d" % msg_idx
+            for term in _tokenize(content):
+                txn.put(index_prefix + term.encode() + posting_suffix, b"")
+        
+        self._msg_counts[session_id] = msg_idx
+    
+    def _message_count(self, session_id: str) -> int:
+        """Number of stored messages in a session"""
+        msg_count = self._msg_counts.get(session_id)
+        if msg_count is None:
+            value = self.db.get(self._session_prefix(session_id) + b"msg_count")
+            msg_count = int(value) if value else 0
+            self._msg_counts[session_id] = msg_count
+        return msg_count
     
     def get_conversation_history(self, session_id: str, last_n: int = 10) -> List[BaseMessage]:
-        """Retrieve recent conversation history"""
-        messages_data = {}
-        prefix = f"sessions.{session_id}.messages."
+        """
+        Retrieve recent conversation history
         
-        for key, value in self.db.scan_prefix(prefix.encode()):
-            key_str = key.decode()
-            parts = key_str.split(".")
-            
-            if len(parts) >= 5:
-                msg_idx = parts[3]
-                field = parts[4]
-                
-                if msg_idx not in messages_data:
-                    messages_data[msg_idx] = {}
-                
-                messages_data[msg_idx][field] = value.decode()
+        The message counter pins down the exact keys of the last N messages,
+        so only those are fetched (one get_batch) instead of scanning, decoding
+        and sorting the whole session.
+        """
+        msg_count = self._message_count(session_id)
+        first_idx = max(1, msg_count - last_n + 1)
         
-        # Sort by index and get last N
-        sorted_indices = sorted(messages_data.keys(), key=int)
-        recent_indices = sorted_indices[-last_n:] if len(sorted_indices) > last_n else sorted_indices
+        keys = [self._message_key(session_id, idx) for idx in range(first_idx, msg_count + 1)]
+        values = self.db.get_batch(keys) if keys else []
         
         # Convert to LangChain messages
         messages = []
-        for idx in recent_indices:
-            data = messages_data[idx]
-            role = data.get("role", "human")
-            content = data.get("content", "")
+        for value in values:
+            if value is None:
+                continue
+            role, content, _, _ = msgpack.unpackb(value)
             
             if role == "human":
                 messages.append(HumanMessage(content=content))
@@ -131,27 +183,43 @@ class SochDBMemoryStore:
     
     def search_conversations(self, session_id: str, query: str, limit: int = 5) -> List[str]:
         """
-        Simple keyword search through conversation history
+        Keyword search through conversation history
         
-        In production, you would use embeddings + vector search here
+        Scans each query term's posting keys, intersects them and fetches
+        only the most recent matching messages. In production, you would use
+        embeddings + vector search here
         """
-        results = []
-        prefix = f"sessions.{session_id}.messages."
+        terms = _tokenize(query)
+        if not terms:
+            return []
         
-        query_lower = query.lower()
+        index_prefix = self._session_prefix(session_id) + b"index."
+        postings = []
+        for term in terms:
+            # int() parses the bytes message index directly without a decode
+            term_prefix = index_prefix + term.encode() + b"."
+            posting = {int(key[len(term_prefix):]) for key, _ in self.db.scan_prefix(term_prefix)}
+            if not posting:
+                return []
+            postings.append(posting)
         
-        for key, value in self.db.scan_prefix(prefix.encode()):
-            key_str = key.decode()
-            
-            if ".content" in key_str:
-                content = value.decode()
-                if query_lower in content.lower():
-                    results.append(content)
-                    
-                    if len(results) >= limit:
-                        break
+        # Intersect starting from the rarest term so the candidate set only shrinks
+        postings.sort(key=len)
+        matches = postings[0]
+        for posting in postings[1:]:
+            if not matches:
+                return []
+            matches &= posting
+        
+        if not matches:
+            return []
         
-        return results
+        # Every match contains all query terms, so rank the ties by recency:
+        # newest messages first, and only those within the limit are fetched
+        keys = [self._message_key(session_id, idx) for idx in sorted(matches, reverse=True)[:limit]]
+        
+        # content is field 1 of the (role, content, timestamp, tool_calls) record
+        return [msgpack.unpackb(value)[1] for value in self.db.get_batch(keys) if value]
     
     def close(self):
         """Close database connection"""
@@ -186,17 +254,30 @@ def search_past_conversations(query: str, state: AgentState) -> str:
         Relevant excerpts from past conversations
     """
     session_id = state.get("session_id", "default")
-    results = memory_store.search_conversations(session_id, query, limit=3)
+    # Over-fetch so duplicates can be dropped and the best matches kept
+    candidates = memory_store.search_conversations(session_id, query, limit=10)
     
-    if not results:
+    if not candidates:
         return f"No past conversations found matching '{query}'"
     
-    formatted_results = "\n\n".join([
-        f"Past message {i+1}: {result[:200]}..."
-        for i, result in enumerate(results)
-    ])
+    # Drop repeats (same normalized opening), then rank by query-term frequency
+    terms = _tokenize(query)
+    seen = set()
+    scored = []
+    for result in candidates:
+        fingerprint = " ".join(result.lower().split())[:60]
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        tf = sum(1 for token in _TOKEN_RE.findall(result.lower()) if token in terms)
+        scored.append((tf, result))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    results = [result for _, result in scored[:3]]
+    
+    # Compact payload: one short line per message keeps the tool output small
+    formatted_results = "\n".join(f"- {result[:80]}" for result in results)
     
-    return f"Found {len(results)} relevant past messages:\n\n{formatted_results}"
+    return f"{len(results)} past messages:\n{formatted_results}"
 
 
 @tool
@@ -232,6 +313,18 @@ tools = [search_past_conversations, get_conversation_summary]
 tool_node = ToolNode(tools)
 
 
+@functools.lru_cache(maxsize=1)
+def _get_llm():
+    """Azure OpenAI LLM with tools bound, built once per process"""
+    return AzureChatOpenAI(
+        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
+        deployment_name=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
+        temperature=0,
+    ).bind_tools(tools)
+
+
 # Create the agent node
 def agent_node(state: AgentState):
     """
@@ -240,14 +333,7 @@ def agent_node(state: AgentState):
     This is where the LLM processes messages and decides whether
     to respond directly or use tools
     """
-    # Initialize Azure OpenAI LLM with tools
-    llm = AzureChatOpenAI(
-        azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-        api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-02-15-preview"),
-        deployment_name=os.getenv("AZURE_OPENAI_DEPLOYMENT"),
-        temperature=0,
-    ).bind_tools(tools)
+    llm = _get_llm()
     
     # Get messages from state
     messages = state["messages"]
@@ -276,6 +362,80 @@ def should_continue(state: AgentState):
     return "end"
 
 
+class EndOfWorkflowCheckpointSaver(MemorySaver):
+    """
+    MemorySaver that defers checkpoint writes to the end of a run
+    
+    LangGraph checkpoints after every node (agent, tools, agent, ...). This
+    saver buffers those puts and persists only the latest one per thread
+    when flush() is called, i.e. once per user turn instead of once per node.
+    Reads flush first, so the graph always resumes from the latest state.
+    The persisted checkpoint's parent is the checkpoint the run started from,
+    so history never points at a dropped intermediate checkpoint.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (thread_id, checkpoint_ns) -> (first config, checkpoint, metadata, merged new_versions)
+        self._pending = {}
+        # checkpoint_id -> [(config, writes, task_id, task_path)]
+        self._pending_writes = {}
+    
+    def put(self, config, checkpoint, metadata, new_versions):
+        """Buffer a checkpoint instead of writing it"""
+        configurable = config["configurable"]
+        key = (configurable["thread_id"], configurable.get("checkpoint_ns", ""))
+        
+        # Channels updated by skipped intermediate checkpoints still need
+        # their latest values stored, so merge the version maps. The first
+        # buffered config is kept: its checkpoint_id is the last persisted
+        # checkpoint, which becomes the parent of the one flushed
+        pending = self._pending.get(key)
+        versions = dict(pending[3]) if pending else {}
+        versions.update(new_versions)
+        parent_config = pending[0] if pending else config
+        self._pending[key] = (parent_config, checkpoint, metadata, versions)
+        
+        return {
+            "configurable": {
+                "thread_id": key[0],
+                "checkpoint_ns": key[1],
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+    
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return self.put(config, checkpoint, metadata, new_versions)
+    
+    def put_writes(self, config, writes, task_id, task_path=""):
+        """Buffer pending writes; only those of the flushed checkpoint are kept"""
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        self._pending_writes.setdefault(checkpoint_id, []).append(
+            (config, writes, task_id, task_path)
+        )
+    
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return self.put_writes(config, writes, task_id, task_path)
+    
+    def flush(self):
+        """Persist the latest buffered checkpoint (and its writes) per thread"""
+        for parent_config, checkpoint, metadata, versions in self._pending.values():
+            super().put(parent_config, checkpoint, metadata, versions)
+            for args in self._pending_writes.get(checkpoint["id"], []):
+                super().put_writes(*args)
+        
+        self._pending.clear()
+        self._pending_writes.clear()
+    
+    def get_tuple(self, config):
+        self.flush()
+        return super().get_tuple(config)
+    
+    def list(self, config, **kwargs):
+        self.flush()
+        return super().list(config, **kwargs)
+
+
 # Build the graph
 def create_agent_graph():
     """Create the LangGraph StateGraph with agent and tool nodes"""
@@ -301,8 +461,9 @@ def create_agent_graph():
     # After tools, always go back to agent
     workflow.add_edge("tools", "agent")
     
-    # Compile with checkpointer for state persistence
-    checkpointer = MemorySaver()
+    # Compile with checkpointer for state persistence; checkpoints are
+    # written once per turn (see EndOfWorkflowCheckpointSaver.flush)
+    checkpointer = EndOfWorkflowCheckpointSaver()
     app = workflow.compile(checkpointer=checkpointer)
     
     return app
@@ -351,6 +512,7 @@ def run_conversation():
                 },
                 config=config
             )
+            app.checkpointer.flush()
             
             # Get the last AI message
             last_message = result["messages"][-1]
@@ -397,6 +559,7 @@ def demo_conversation():
             {"messages": [user_msg], "session_id": session_id},
             config=config
         )
+        app.checkpointer.flush()
         
         last_msg = result["messages"][-1]
         if isinstance(last_msg, AIMessage):
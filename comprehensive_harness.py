@@ -19,20 +19,37 @@ Scenarios:
 """
 
 import json
+import math
 import os
 import random
 import shutil
 import sys
+import tempfile
+import threading
 import time
+import zlib
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from dotenv import load_dotenv
 
+try:
+    from numba import njit, prange
+except ImportError:
+    # Optional: generate_embeddings_batch falls back to plain NumPy
+    njit = None
+
+try:
+    import orjson
+except ImportError:
+    # Optional: the scorecard is written with stdlib json instead
+    orjson = None
+
 # Using sochdb from pip install (not local SDK path)
 from sochdb import Database
 try:
@@ -42,14 +59,94 @@ except ImportError:
     class TransactionConflictError(Exception):
         pass
 
+from harness_scenarios.base_scenario import result_id
+
+
+class _SimulatedFailure(Exception):
+    """Raised inside a transaction to exercise rollback."""
+
+
 # Load environment
 load_dotenv()
 
+# Monotonic, high-resolution clock for latency timing (bound once for hot loops)
+_pc = time.perf_counter_ns
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _embed_topics(centroids, topic_ids, noise, out):
+        """out[i] = normalize(centroids[topic_ids[i]] + noise[i]), rows in parallel."""
+        for i in prange(topic_ids.shape[0]):
+            v = centroids[topic_ids[i]] + noise[i]
+            out[i] = v / np.sqrt((v * v).sum())
+else:
+    _embed_topics = None
+
 
 # ============================================================================
 # Synthetic Data Generator
 # ============================================================================
 
+@dataclass
+class DocBatch:
+    """Column-oriented batch of generated documents (one array per field)."""
+    tenant_id: str
+    collection_name: str
+    ids: List[str]
+    topic_ids: np.ndarray  # (N,) int64
+    embeddings: np.ndarray  # (N, D) float32, or float16 for low-precision collections
+    contents: List[str]
+    _gt_index: Optional[Dict[int, frozenset]] = field(default=None, init=False, repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def metadata(self, i: int) -> Dict[str, Any]:
+        """Build the metadata dict for document i."""
+        topic_id = int(self.topic_ids[i])
+        return {
+            "tenant": self.tenant_id,
+            "collection": self.collection_name,
+            "topic": topic_id,
+            "timestamp": datetime.now().isoformat(),
+        }
+    
+    def relevant_ids(self, topic_id: int) -> frozenset:
+        """Ids of all documents on the given topic (ground truth)."""
+        if self._gt_index is None:
+            # One pass over the batch builds topic_id -> ids for every query
+            index = defaultdict(list)
+            for doc_id, doc_topic in zip(self.ids, self.topic_ids.tolist()):
+                index[doc_topic].append(doc_id)
+            self._gt_index = {topic: frozenset(ids) for topic, ids in index.items()}
+        return self._gt_index.get(topic_id, frozenset())
+    
+    def records(self) -> List[Tuple[str, List[float], Dict[str, Any], str]]:
+        """(id, vector, metadata, content) rows for collection.insert_batch."""
+        return [
+            (doc_id, vector, self.metadata(i), content)
+            for i, (doc_id, vector, content) in enumerate(
+                zip(self.ids, self.embeddings.tolist(), self.contents)
+            )
+        ]
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize the row-oriented dict form used by callers that store docs."""
+        return [
+            {
+                "id": doc_id,
+                "topic_id": topic_id,
+                "embedding": embedding,
+                "content": content,
+                "metadata": self.metadata(i),
+            }
+            for i, (doc_id, topic_id, embedding, content) in enumerate(
+                zip(self.ids, self.topic_ids.tolist(), self.embeddings.tolist(), self.contents)
+            )
+        ]
+
+
 class SyntheticGenerator:
     """
     Deterministically creates synthetic data for testing:
@@ -80,6 +177,22 @@ class SyntheticGenerator:
         self.embedding_dim = 384
         self.topic_centroids = self._generate_topic_centroids()
         self.topic_keywords = self._generate_topic_keywords()
+        self._kw_pool, self._kw_idx = self._build_keyword_index()
+        self._content_cache = self._build_content_cache()
+        
+        # Noise pool for generate_embedding, refilled lazily one block at a time
+        self.noise_pool_rows = 1024
+        self._noise_pool = np.empty((0, self.embedding_dim), dtype=np.float32)
+        self._noise_cursor = 0
+        
+        # Generated doc batches / query sets keyed by their arguments, so a
+        # repeated request shares one set of arrays instead of re-embedding
+        self._doc_cache: Dict[tuple, DocBatch] = {}
+        # (topic ids, texts, read-only embeddings) per query set
+        self._query_cache: Dict[tuple, Tuple[List[int], List[str], np.ndarray]] = {}
+        # Held while filling either cache, so concurrent scenarios never
+        # generate (and then overwrite) the same entry twice
+        self._cache_lock = threading.Lock()
         
     def _generate_topic_centroids(self) -> np.ndarray:
         """Generate unit-normalized topic centroid vectors."""
@@ -88,9 +201,7 @@ class SyntheticGenerator:
         norms = np.linalg.norm(centroids, axis=1, keepdims=True)
         return centroids / norms
     
-    def _generate_topic_keywords(self) -> Dict[int, List[str]]:
-        """Generate topic-specific keywords for BM25 signal."""
-        keyword_pool = [
+    KEYWORD_POOL = [
             "authentication", "authorization", "database", "network", "security",
             "performance", "latency", "throughput", "error", "exception",
             "deployment", "rollback", "scale", "memory", "cpu",
@@ -99,29 +210,82 @@ class SyntheticGenerator:
             "invoice", "ledger", "payment", "transaction", "reconcile",
             "embedding", "vector", "search", "index", "query",
             "machine learning", "model", "training", "inference", "prediction",
-        ]
-        
+    ]
+    
+    def _generate_topic_keywords(self) -> Dict[int, List[str]]:
+        """Generate topic-specific keywords for BM25 signal."""
         keywords = {}
         for topic_id in range(self.num_topics):
             # Assign 3-5 keywords per topic
             num_kw = random.randint(3, 5)
-            keywords[topic_id] = random.sample(keyword_pool, num_kw)
+            keywords[topic_id] = random.sample(self.KEYWORD_POOL, num_kw)
         return keywords
     
+    def _build_keyword_index(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Flat keyword pool plus a (num_topics, 5) int16 index into it.
+        
+        Unused slots (topics with fewer than 5 keywords) hold -1. Lets batch
+        paths gather e.g. every query's first keyword in one indexed read.
+        """
+        pool = np.array(self.KEYWORD_POOL, dtype=object)
+        position = {kw: i for i, kw in enumerate(self.KEYWORD_POOL)}
+        idx = np.full((self.num_topics, 5), -1, dtype=np.int16)
+        for topic_id, keywords in self.topic_keywords.items():
+            idx[topic_id, :len(keywords)] = [position[kw] for kw in keywords]
+        return pool, idx
+    
     def generate_embedding(self, topic_id: int, noise_std: float = 0.1) -> List[float]:
         """Generate embedding with known topic for ground-truth."""
         centroid = self.topic_centroids[topic_id]
-        noise = np.random.randn(self.embedding_dim) * noise_std
+        noise = self._next_noise() * noise_std
         vector = centroid + noise
         # Normalize
         vector = vector / np.linalg.norm(vector)
         return vector.tolist()
     
-    def generate_content(self, topic_id: int, doc_type: str = "support") -> str:
-        """Generate text content with topic keywords."""
-        keywords = self.topic_keywords[topic_id]
+    def _next_noise(self) -> np.ndarray:
+        """Hand out the next standard-normal row from the preallocated pool."""
+        if self._noise_cursor >= len(self._noise_pool):
+            self._noise_pool = np.random.randn(
+                self.noise_pool_rows, self.embedding_dim
+            ).astype(np.float32)
+            self._noise_cursor = 0
+        noise = self._noise_pool[self._noise_cursor]
+        self._noise_cursor += 1
+        return noise
+    
+    def assign_topics(self, key: str, count: int) -> np.ndarray:
+        """
+        Map item indices 0..count-1 under `key` to topic ids.
         
-        templates = {
+        splitmix64 over a crc32 seed of the key: one string per batch instead
+        of one per item, and stable across processes unlike the salted hash().
+        """
+        seed = np.uint64(zlib.crc32(key.encode()))
+        z = seed + np.arange(count, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        z ^= z >> np.uint64(31)
+        return (z % np.uint64(self.num_topics)).astype(np.int64)
+    
+    def generate_embeddings_batch(self, topic_ids: np.ndarray, noise_std: float = 0.1) -> np.ndarray:
+        """Generate one embedding per topic id in a single vectorized pass."""
+        noise = np.random.randn(len(topic_ids), self.embedding_dim) * noise_std
+        if _embed_topics is not None:
+            vectors = np.empty_like(noise)
+            _embed_topics(self.topic_centroids, topic_ids, noise, vectors)
+            return vectors
+        
+        vectors = self.topic_centroids[topic_ids] + noise
+        # Normalize row-wise
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+    
+    @staticmethod
+    def _format_templates(keywords: List[str]) -> Dict[str, List[str]]:
+        """Fully formatted content templates per doc type for one topic."""
+        return {
             "support": [
                 f"Customer experiencing issues with {keywords[0]}. Need to investigate {keywords[1]} and {keywords[2]}.",
                 f"Troubleshooting {keywords[0]} problem. Related to {keywords[1]} configuration.",
@@ -140,19 +304,31 @@ class SyntheticGenerator:
                 f"[WARN] {keywords[0]} threshold exceeded. Review {keywords[1]} metrics.",
             ],
         }
-        
-        template = random.choice(templates.get(doc_type, templates["support"]))
-        return template
+    
+    def _build_content_cache(self) -> Dict[Tuple[int, str], List[str]]:
+        """Precompute every (topic_id, doc_type) template once."""
+        cache = {}
+        for topic_id, keywords in self.topic_keywords.items():
+            for doc_type, templates in self._format_templates(keywords).items():
+                cache[(topic_id, doc_type)] = templates
+        return cache
+    
+    def generate_content(self, topic_id: int, doc_type: str = "support") -> str:
+        """Generate text content with topic keywords."""
+        templates = self._content_cache.get((topic_id, doc_type))
+        if templates is None:
+            templates = self._content_cache[(topic_id, "support")]
+        return random.choice(templates)
     
     def generate_paraphrase_group(self, topic_id: int, num_paraphrases: int = 5) -> List[str]:
         """Generate paraphrase queries for same topic (for cache testing)."""
-        base_keywords = self.topic_keywords[topic_id]
+        keyword = self._kw_pool[self._kw_idx[topic_id, 0]]
         paraphrases = [
-            f"How do I fix {base_keywords[0]} issues?",
-            f"What's the solution for {base_keywords[0]} problems?",
-            f"Help with {base_keywords[0]} errors",
-            f"Troubleshooting {base_keywords[0]}",
-            f"{base_keywords[0]} not working correctly",
+            f"How do I fix {keyword} issues?",
+            f"What's the solution for {keyword} problems?",
+            f"Help with {keyword} errors",
+            f"Troubleshooting {keyword}",
+            f"{keyword} not working correctly",
         ]
         return paraphrases[:num_paraphrases]
     
@@ -160,6 +336,52 @@ class SyntheticGenerator:
         """Generate tenant IDs."""
         return [f"tenant_{i:03d}" for i in range(self.params["tenants"])]
     
+    def generate_doc_batch(
+        self, 
+        tenant_id: str, 
+        collection_name: str,
+        num_docs: Optional[int] = None,
+        dtype: type = np.float32
+    ) -> DocBatch:
+        """
+        Generate documents for a collection as a column-oriented batch.
+        
+        `dtype=np.float16` halves embedding memory for collections whose
+        checks don't depend on recall precision. Identical requests return the
+        same cached batch; its embeddings are read-only since they are shared.
+        """
+        if num_docs is None:
+            num_docs = self.params["docs_per_collection"]
+        cache_key = (tenant_id, collection_name, num_docs, np.dtype(dtype).str)
+        with self._cache_lock:
+            cached = self._doc_cache.get(cache_key)
+            if cached is None:
+                cached = self._doc_cache[cache_key] = self._build_doc_batch(
+                    tenant_id, collection_name, num_docs, dtype
+                )
+        return cached
+    
+    def _build_doc_batch(
+        self, tenant_id: str, collection_name: str, num_docs: int, dtype: type
+    ) -> DocBatch:
+        """Generate one uncached DocBatch (see generate_doc_batch)."""
+        # Assign topics (deterministic based on doc_id), then embed all docs at once
+        doc_ids = [f"{tenant_id}_{collection_name}_{doc_id}" for doc_id in range(num_docs)]
+        topic_ids = self.assign_topics(f"{tenant_id}_{collection_name}", num_docs)
+        # Stored as float32 (1.5 KB per 384-dim vector) rather than list[float]
+        embeddings = self.generate_embeddings_batch(topic_ids).astype(dtype)
+        embeddings.flags.writeable = False
+        contents = [self.generate_content(topic_id, collection_name) for topic_id in topic_ids.tolist()]
+        
+        return DocBatch(
+            tenant_id=tenant_id,
+            collection_name=collection_name,
+            ids=doc_ids,
+            topic_ids=topic_ids,
+            embeddings=embeddings,
+            contents=contents,
+        )
+    
     def generate_collection_docs(
         self, 
         tenant_id: str, 
@@ -167,30 +389,7 @@ class SyntheticGenerator:
         num_docs: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """Generate documents for a collection."""
-        if num_docs is None:
-            num_docs = self.params["docs_per_collection"]
-        
-        docs = []
-        for doc_id in range(num_docs):
-            # Assign topic (deterministic based on doc_id)
-            topic_id = (hash(f"{tenant_id}_{collection_name}_{doc_id}") % self.num_topics)
-            
-            embedding = self.generate_embedding(topic_id)
-            content = self.generate_content(topic_id, collection_name)
-            
-            docs.append({
-                "id": f"{tenant_id}_{collection_name}_{doc_id}",
-                "topic_id": topic_id,
-                "embedding": embedding,
-                "content": content,
-                "metadata": {
-                    "tenant": tenant_id,
-                    "collection": collection_name,
-                    "topic": topic_id,
-                    "timestamp": datetime.now().isoformat(),
-                }
-            })
-        return docs
+        return self.generate_doc_batch(tenant_id, collection_name, num_docs).to_dicts()
     
     def generate_queries(
         self, 
@@ -198,27 +397,45 @@ class SyntheticGenerator:
         collection_name: str,
         num_queries: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Generate query sets with ground-truth."""
+        """
+        Generate query sets with ground-truth.
+        
+        Topics, texts and embeddings are cached per argument tuple; every call
+        builds fresh dicts (and embedding lists), so callers may edit them.
+        """
         if num_queries is None:
             num_queries = self.params["queries"]
+        cache_key = (tenant_id, collection_name, num_queries)
+        with self._cache_lock:
+            cached = self._query_cache.get(cache_key)
+            if cached is None:
+                # Use topic to ensure we know relevant docs
+                topic_ids = self.assign_topics(f"query_{tenant_id}_{collection_name}", num_queries)
+                embeddings = self.generate_embeddings_batch(topic_ids, noise_std=0.05).astype(np.float32)
+                embeddings.flags.writeable = False
+                
+                # First keyword of every query's topic in one gather
+                first_keywords = self._kw_pool[self._kw_idx[topic_ids, 0]].tolist()
+                texts = [
+                    f"How to {random.choice(['fix', 'resolve', 'troubleshoot'])} {keyword}"
+                    for keyword in first_keywords
+                ]
+                cached = self._query_cache[cache_key] = (topic_ids.tolist(), texts, embeddings)
         
-        queries = []
-        for query_id in range(num_queries):
-            # Use topic to ensure we know relevant docs
-            topic_id = (hash(f"query_{tenant_id}_{collection_name}_{query_id}") % self.num_topics)
-            
-            query_embedding = self.generate_embedding(topic_id, noise_std=0.05)
-            query_text = f"How to {random.choice(['fix', 'resolve', 'troubleshoot'])} {self.topic_keywords[topic_id][0]}"
-            
-            # Ground truth: docs with same topic_id are relevant
-            queries.append({
+        topic_list, texts, embeddings = cached
+        # Ground truth: docs with same topic_id are relevant
+        return [
+            {
                 "id": f"query_{query_id}",
                 "topic_id": topic_id,
                 "embedding": query_embedding,
                 "text": query_text,
                 "tenant": tenant_id,
-            })
-        return queries
+            }
+            for query_id, (topic_id, query_text, query_embedding) in enumerate(
+                zip(topic_list, texts, embeddings.tolist())
+            )
+        ]
     
     def generate_graph_data(self, tenant_id: str) -> Dict[str, Any]:
         """Generate graph nodes and edges for SecOps/temporal scenarios."""
@@ -247,15 +464,14 @@ class SyntheticGenerator:
         # Edges
         edges = []
         for incident in incidents:
-            # Create edges within cluster
-            for i, host in enumerate(incident["cluster_hosts"]):
-                for other_host in incident["cluster_hosts"][i+1:]:
-                    edges.append({
-                        "from": host,
-                        "to": other_host,
-                        "type": "network_traffic",
-                        "incident_id": incident["id"],
-                    })
+            # Create edges within cluster: every (i < j) host pair
+            cluster = np.array(incident["cluster_hosts"])
+            i_idx, j_idx = np.triu_indices(len(cluster), k=1)
+            incident_id = incident["id"]
+            edges.extend(
+                {"from": a, "to": b, "type": "network_traffic", "incident_id": incident_id}
+                for a, b in zip(cluster[i_idx].tolist(), cluster[j_idx].tolist())
+            )
         
         return {
             "hosts": hosts,
@@ -269,6 +485,56 @@ class SyntheticGenerator:
 # Metrics Recorder
 # ============================================================================
 
+def _p95_rank(n):
+    """0-based nearest-rank index of the 95th percentile among n sorted samples."""
+    return np.maximum((95 * np.asarray(n) + 99) // 100 - 1, 0)
+
+
+class LatencyHistogram:
+    """
+    Streaming latency histogram: fixed log-spaced bins, bounded memory.
+    
+    Bin 0 holds samples <= MIN_MS; bin i covers (MIN_MS*GROWTH**(i-1),
+    MIN_MS*GROWTH**i] and the last bin absorbs everything above MAX_MS.
+    Percentiles are reported as a bin's upper edge (~1% relative error).
+    """
+    __slots__ = ("counts", "n")
+    
+    MIN_MS = 1e-3
+    MAX_MS = 1e5
+    GROWTH = 1.01
+    _LOG_GROWTH = math.log(GROWTH)
+    NUM_BINS = int(math.ceil(math.log(MAX_MS / MIN_MS) / _LOG_GROWTH)) + 2
+    UPPER_EDGES = MIN_MS * GROWTH ** np.arange(NUM_BINS, dtype=np.float64)
+    
+    def __init__(self):
+        self.counts = np.zeros(self.NUM_BINS, dtype=np.uint32)
+        self.n = 0
+    
+    def append(self, value: float):
+        """Record one sample."""
+        if value <= self.MIN_MS:
+            b = 0
+        else:
+            b = min(int(math.log(value / self.MIN_MS) / self._LOG_GROWTH) + 1, self.NUM_BINS - 1)
+        self.counts[b] += 1
+        self.n += 1
+    
+    @classmethod
+    def p95_of(cls, counts: np.ndarray) -> np.ndarray:
+        """Nearest-rank p95 per row of a (..., NUM_BINS) count array; one cumsum pass."""
+        cum = np.cumsum(counts, axis=-1)
+        target = _p95_rank(cum[..., -1]) + 1
+        return cls.UPPER_EDGES[(cum < target[..., None]).sum(axis=-1)]
+    
+    def p95(self) -> float:
+        """Nearest-rank p95 of the recorded samples."""
+        return float(self.p95_of(self.counts))
+    
+    def __len__(self) -> int:
+        return self.n
+
+
 @dataclass
 class ScenarioMetrics:
     """Metrics for a single scenario."""
@@ -292,7 +558,7 @@ class ScenarioMetrics:
     p95_token_count: Optional[float] = None
     
     # Performance
-    latencies: Dict[str, List[float]] = field(default_factory=lambda: defaultdict(list))
+    latencies: Dict[str, LatencyHistogram] = field(default_factory=lambda: defaultdict(LatencyHistogram))
     
     # Transactions
     conflict_rate: Optional[float] = None
@@ -306,18 +572,18 @@ class ScenarioMetrics:
         self.latencies[op_type].append(duration_ms)
     
     def get_p95_latency(self, op_type: str) -> Optional[float]:
-        """Get p95 latency for operation type."""
-        if op_type not in self.latencies or not self.latencies[op_type]:
+        """Get nearest-rank p95 latency for operation type."""
+        if op_type not in self.latencies or not len(self.latencies[op_type]):
             return None
-        return float(np.percentile(self.latencies[op_type], 95))
+        return self.latencies[op_type].p95()
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        p95_latencies = {}
-        for op_type in self.latencies:
-            p95 = self.get_p95_latency(op_type)
-            if p95 is not None:
-                p95_latencies[op_type] = p95
+        p95_latencies = {
+            op_type: latencies.p95()
+            for op_type, latencies in self.latencies.items()
+            if len(latencies)
+        }
         
         return {
             "passed": self.passed,
@@ -357,6 +623,7 @@ class MetricsRecorder:
     
     def __init__(self):
         self.scenarios: Dict[str, ScenarioMetrics] = {}
+        self._dcg_discount = 1.0 / np.log2(np.arange(2, 12))
     
     def get_or_create(self, scenario_id: str) -> ScenarioMetrics:
         """Get or create metrics for scenario."""
@@ -364,55 +631,88 @@ class MetricsRecorder:
             self.scenarios[scenario_id] = ScenarioMetrics(scenario_id=scenario_id)
         return self.scenarios[scenario_id]
     
+    @staticmethod
+    def _as_set(ground_truth) -> frozenset:
+        """Ground truth as a set (callers may pass one to skip the conversion)."""
+        if isinstance(ground_truth, (set, frozenset)):
+            return ground_truth
+        return frozenset(ground_truth)
+    
+    def _discount(self, k: int) -> np.ndarray:
+        """1/log2(rank+1) for ranks 1..k (precomputed, grown on demand)."""
+        if k > len(self._dcg_discount):
+            self._dcg_discount = 1.0 / np.log2(np.arange(2, k + 2))
+        return self._dcg_discount[:k]
+    
     def compute_ndcg(
         self, 
-        results: List[Dict[str, Any]], 
+        results: Sequence[Any], 
+        ground_truth: List[str],
+        k: int = 10
+    ) -> float:
+        """Compute NDCG@k (results may be SDK hits or ``{"id": ...}`` dicts)."""
+        return self.compute_ndcg_ids([result_id(r) for r in results[:k]], ground_truth, k)
+    
+    def compute_ndcg_ids(
+        self,
+        ids: Sequence[str],
         ground_truth: List[str],
         k: int = 10
     ) -> float:
-        """Compute NDCG@k."""
-        if not results or not ground_truth:
+        """Compute NDCG@k from result ids in rank order (no per-result dicts)."""
+        if not len(ids) or not ground_truth:
             return 0.0
         
+        relevant = self._as_set(ground_truth)
+        top = ids[:k]
+        
         # Build relevance scores
-        relevance = []
-        for i, result in enumerate(results[:k]):
-            doc_id = result.get("id")
-            relevance.append(1.0 if doc_id in ground_truth else 0.0)
+        relevance = np.fromiter(
+            (doc_id in relevant for doc_id in top),
+            dtype=np.float64,
+            count=len(top),
+        )
+        discount = self._discount(len(top))
         
         # DCG
-        dcg = sum(rel / np.log2(i + 2) for i, rel in enumerate(relevance))
+        dcg = float(relevance @ discount)
         
-        # IDCG (ideal)
-        ideal_relevance = sorted(relevance, reverse=True)
-        idcg = sum(rel / np.log2(i + 2) for i, rel in enumerate(ideal_relevance))
+        # IDCG (ideal): all hits ranked first
+        idcg = float(discount[:int(relevance.sum())].sum())
         
         return dcg / idcg if idcg > 0 else 0.0
     
     def compute_recall(
         self,
-        results: List[Dict[str, Any]],
+        results: Sequence[Any],
+        ground_truth: List[str],
+        k: int = 10
+    ) -> float:
+        """Compute Recall@k (results may be SDK hits or ``{"id": ...}`` dicts)."""
+        return self.compute_recall_ids([result_id(r) for r in results[:k]], ground_truth, k)
+    
+    def compute_recall_ids(
+        self,
+        ids: Sequence[str],
         ground_truth: List[str],
         k: int = 10
     ) -> float:
-        """Compute Recall@k."""
+        """Compute Recall@k from result ids in rank order."""
         if not ground_truth:
             return 0.0
         
-        retrieved = set(r.get("id") for r in results[:k])
-        relevant = set(ground_truth)
-        
-        hits = len(retrieved & relevant)
+        relevant = self._as_set(ground_truth)
+        hits = len(relevant.intersection(ids[:k]))
         return hits / len(relevant)
     
     def compute_mrr(
         self,
-        results: List[Dict[str, Any]],
+        results: Sequence[Any],
         ground_truth: List[str]
     ) -> float:
         """Compute Mean Reciprocal Rank."""
         for i, result in enumerate(results):
-            if result.get("id") in ground_truth:
+            if result_id(result) in ground_truth:
                 return 1.0 / (i + 1)
         return 0.0
 
@@ -421,6 +721,16 @@ class MetricsRecorder:
 # Scenario Runner
 # ============================================================================
 
+@dataclass
+class HybridEval:
+    """Per-query hybrid-search quality for one query set (arrays in query order)."""
+    ndcg: np.ndarray  # float64 NDCG@k
+    recall: np.ndarray  # float64 Recall@k
+    top1: np.ndarray  # bool, first result relevant
+    top3: np.ndarray  # bool, any of the first three relevant
+    latencies_ms: List[float]
+
+
 class ScenarioRunner:
     """Runs test scenarios and collects metrics."""
     
@@ -429,15 +739,134 @@ class ScenarioRunner:
         db: Database,
         generator: SyntheticGenerator,
         recorder: MetricsRecorder,
-        mode: str = "embedded"
+        mode: str = "embedded",
+        search_workers: int = 1
     ):
         self.db = db
         self.generator = generator
         self.recorder = recorder
         self.mode = mode
+        # Searches are timed serially by default; with search_workers > 1 they
+        # fan out over a shared pool and latencies include thread contention
+        self.search_workers = search_workers
+        # Shared pool for in-flight searches, created on first use under the
+        # lock so concurrent scenarios never each build (and leak) one
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._io_pool_lock = threading.Lock()
+        # Vectorized RNG for the simulated scenarios (07, 09, 10)
+        self.rng = np.random.default_rng(generator.seed)
+        # Id of the scenario running on this thread, for log prefixes
+        self._local = threading.local()
+        # Namespaces / (namespace, collection) pairs already known to exist
+        self._ensured_ns: set = set()
+        self._ensured_collections: set = set()
+    
+    def _ensure_namespace(self, name: str):
+        """Create namespace `name` unless this runner already ensured it."""
+        if name not in self._ensured_ns:
+            self.db.get_or_create_namespace(name)
+            self._ensured_ns.add(name)
+    
+    def _ensure_collection(self, ns, ns_name: str, name: str, **config):
+        """Return collection `name` in `ns`, creating it with `config` if missing."""
+        key = (ns_name, name)
+        if key not in self._ensured_collections:
+            # Marked only once the collection is known to exist, so a failed
+            # create is retried (and re-raised) instead of masked later
+            if name not in ns.list_collections():
+                collection = ns.create_collection(name, **config)
+                self._ensured_collections.add(key)
+                return collection
+            self._ensured_collections.add(key)
+        return ns.collection(name)
+    
+    def _batched_search(
+        self,
+        collection,
+        queries: List[Dict[str, Any]],
+        k: int = 10,
+        hybrid: bool = False,
+        **search_kwargs
+    ) -> Tuple[List[Any], List[float]]:
+        """
+        Run one search per query, serially unless search_workers > 1 (then
+        on the runner's shared thread pool).
+        
+        Returns the per-query results and per-query latencies in ms, both in
+        query order; each latency times its own search only.
+        """
+        if not queries:
+            return [], []
+        
+        vectors = [q["embedding"] for q in queries]
+        
+        def search(i):
+            start = _pc()
+            if hybrid:
+                results = collection.hybrid_search(
+                    vector=vectors[i], text_query=queries[i]["text"], k=k, **search_kwargs
+                )
+            else:
+                results = collection.vector_search(vectors[i], k=k, **search_kwargs)
+            return results, (_pc() - start) / 1_000_000
+        
+        if self.search_workers <= 1:
+            timed = [search(i) for i in range(len(queries))]
+        else:
+            with self._io_pool_lock:
+                if self._io_pool is None:
+                    self._io_pool = ThreadPoolExecutor(max_workers=self.search_workers)
+                pool = self._io_pool
+            timed = list(pool.map(search, range(len(queries))))
+        return [results for results, _ in timed], [ms for _, ms in timed]
+    
+    def _eval_hybrid_queries(
+        self,
+        collection,
+        queries: List[Dict[str, Any]],
+        docs: DocBatch,
+        k: int = 10,
+        **search_kwargs
+    ) -> HybridEval:
+        """Hybrid-search every query and score it against docs' topic ground truth."""
+        batch_results, latencies_ms = self._batched_search(
+            collection, queries, k=k, hybrid=True, **search_kwargs
+        )
+        
+        n = len(queries)
+        ndcg = np.empty(n, dtype=np.float64)
+        recall = np.empty(n, dtype=np.float64)
+        top1 = np.zeros(n, dtype=bool)
+        top3 = np.zeros(n, dtype=bool)
+        
+        for i, (query, results) in enumerate(zip(queries, batch_results)):
+            # Ground truth: docs with same topic
+            ground_truth = docs.relevant_ids(query["topic_id"])
+            result_ids = [r.id for r in results]
+            
+            ndcg[i] = self.recorder.compute_ndcg_ids(result_ids, ground_truth, k=k)
+            recall[i] = self.recorder.compute_recall_ids(result_ids, ground_truth, k=k)
+            top1[i] = bool(result_ids) and result_ids[0] in ground_truth
+            top3[i] = not ground_truth.isdisjoint(result_ids[:3])
+        
+        return HybridEval(ndcg, recall, top1, top3, latencies_ms)
     
-    def run_all(self) -> Dict[str, ScenarioMetrics]:
-        """Run all 10 scenarios."""
+    @staticmethod
+    def _bulk_insert(collection, records: List[Tuple], batch_size: int = 2048):
+        """Insert (id, vector, metadata, content) rows with insert_batch, batch_size at a time."""
+        for offset in range(0, len(records), batch_size):
+            collection.insert_batch(records[offset:offset + batch_size])
+    
+    def run_all(self, max_workers: int = 1) -> Dict[str, ScenarioMetrics]:
+        """
+        Run all 10 scenarios.
+        
+        Serial by default, so a seeded run is reproducible. With max_workers > 1
+        scenarios run concurrently, each in its own namespace and writing only
+        its own ScenarioMetrics; they share the generator's RNG, so results then
+        vary between runs. Log lines carry the scenario id, so interleaved
+        output stays attributable.
+        """
         scenarios = [
             ("01_multi_tenant_support", self.scenario_01_multi_tenant),
             ("02_sales_crm", self.scenario_02_sales_crm),
@@ -455,20 +884,47 @@ class ScenarioRunner:
         print(f"Running {len(scenarios)} Scenarios in {self.mode} mode")
         print(f"{'='*80}\n")
         
-        for scenario_id, scenario_func in scenarios:
-            print(f"\n[{scenario_id}] Starting...")
-            metrics = self.recorder.get_or_create(scenario_id)
-            
-            try:
-                scenario_func(metrics)
-                print(f"[{scenario_id}] {'✓ PASSED' if metrics.passed else '✗ FAILED'}")
-            except Exception as e:
-                metrics.passed = False
-                metrics.errors.append(str(e))
-                print(f"[{scenario_id}] ✗ EXCEPTION: {e}")
+        # Register up front so the recorder keeps scenario order
+        for scenario_id, _ in scenarios:
+            self.recorder.get_or_create(scenario_id)
+        
+        try:
+            if max_workers <= 1:
+                for scenario_id, scenario_func in scenarios:
+                    self._run_scenario(scenario_id, scenario_func)
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(scenarios))) as pool:
+                    list(pool.map(lambda item: self._run_scenario(*item), scenarios))
+        finally:
+            with self._io_pool_lock:
+                if self._io_pool is not None:
+                    self._io_pool.shutdown()
+                    self._io_pool = None
         
         return self.recorder.scenarios
     
+    def _log(self, message: str):
+        """Print one line prefixed with the id of this thread's scenario."""
+        # Scenario methods called directly (outside run_all) have no id set
+        scenario_id = getattr(self._local, "scenario_id", None)
+        prefix = f"[{scenario_id}] " if scenario_id else "  "
+        # A single write per line keeps concurrent scenarios' lines whole
+        sys.stdout.write(f"{prefix}{message}\n")
+    
+    def _run_scenario(self, scenario_id: str, scenario_func):
+        """Run one scenario, recording a failure if it raises."""
+        self._local.scenario_id = scenario_id
+        self._log("Starting...")
+        metrics = self.recorder.get_or_create(scenario_id)
+        
+        try:
+            scenario_func(metrics)
+            self._log("✓ PASSED" if metrics.passed else "✗ FAILED")
+        except Exception as e:
+            metrics.passed = False
+            metrics.errors.append(str(e))
+            self._log(f"✗ EXCEPTION: {e}")
+    
     # ========================================================================
     # Scenario 1: Multi-tenant Support Agent
     # ========================================================================
@@ -491,58 +947,60 @@ class ScenarioRunner:
         
         for tenant_id in tenants:
             # Create namespace if it doesn't exist
-            try:
-                ns = self.db.create_namespace(tenant_id)
-            except:
-                ns = self.db.namespace(tenant_id)
+            self._ensure_namespace(tenant_id)
             
             with self.db.use_namespace(tenant_id) as ns:
                 # Create support docs collection
-                try:
-                    collection = ns.create_collection(
-                        "support_docs",
-                        dimension=self.generator.embedding_dim,
-                        enable_hybrid_search=True,
-                        content_field="content"
-                    )
-                except:
-                    # Collection already exists
-                    collection = ns.collection("support_docs")
-                    
+                collection = self._ensure_collection(
+                    ns, tenant_id, "support_docs",
+                    dimension=self.generator.embedding_dim,
+                    enable_hybrid_search=True,
+                    content_field="content"
+                )
                 collections[tenant_id] = collection
                 
                 # Insert documents
-                docs = self.generator.generate_collection_docs(tenant_id, "support")
+                docs = self.generator.generate_doc_batch(tenant_id, "support")
                 all_docs[tenant_id] = docs
                 
-                for doc in docs:
-                    collection.insert(
-                        id=doc["id"],
-                        vector=doc["embedding"],
-                        metadata=doc["metadata"],
-                        content=doc["content"]
-                    )
-        
-        # Test 1: Namespace isolation (leakage check)
+                self._bulk_insert(collection, docs.records())
+        
+        # Test 1: Namespace isolation (leakage check) on every tenant, and
+        # Test 2: Hybrid search quality on the first tenant, in one pass
+        primary_tenant = tenants[0]
         cross_tenant_hits = 0
         total_queries = 0
+        # Filled on the primary tenant, one slot per query
+        ndcg_scores = np.empty(0, dtype=np.float64)
+        recall_scores = np.empty(0, dtype=np.float64)
         
         for tenant_id in tenants:
             with self.db.use_namespace(tenant_id) as ns:
                 collection = ns.collection("support_docs")
                 queries = self.generator.generate_queries(tenant_id, "support", num_queries=10)
+                batch_results, latencies_ms = self._batched_search(collection, queries, k=10)
                 
-                for query in queries:
-                    start = time.time()
-                    results = collection.vector_search(query["embedding"], k=10)
-                    duration_ms = (time.time() - start) * 1000
+                for duration_ms in latencies_ms:
                     metrics.add_latency("vector_search", duration_ms)
-                    
-                    # Check for leakage
-                    for result in results:
-                        if not result.id.startswith(tenant_id):
-                            cross_tenant_hits += 1
-                    total_queries += 1
+                
+                # Check for leakage over every result id of the batch at once
+                cross_tenant_hits += sum(
+                    1 for results in batch_results for result in results
+                    if not result.id.startswith(tenant_id)
+                )
+                total_queries += len(batch_results)
+                
+                if tenant_id != primary_tenant:
+                    continue
+                
+                # Hybrid search, reusing the same queries
+                evaluation = self._eval_hybrid_queries(
+                    collection, queries, all_docs[tenant_id], k=10, alpha=0.5
+                )
+                for duration_ms in evaluation.latencies_ms:
+                    metrics.add_latency("hybrid_search", duration_ms)
+                ndcg_scores = evaluation.ndcg
+                recall_scores = evaluation.recall
         
         metrics.leakage_rate = cross_tenant_hits / total_queries if total_queries > 0 else 0.0
         
@@ -550,53 +1008,18 @@ class ScenarioRunner:
             metrics.passed = False
             metrics.errors.append(f"Namespace leakage detected: {metrics.leakage_rate:.2%}")
         
-        # Test 2: Hybrid search quality
-        tenant_id = tenants[0]
-        with self.db.use_namespace(tenant_id) as ns:
-            collection = ns.collection("support_docs")
-            queries = self.generator.generate_queries(tenant_id, "support", num_queries=10)
-            
-            ndcg_scores = []
-            recall_scores = []
-            
-            for query in queries:
-                # Ground truth: docs with same topic
-                ground_truth = [
-                    doc["id"] for doc in all_docs[tenant_id]
-                    if doc["topic_id"] == query["topic_id"]
-                ]
-                
-                # Hybrid search
-                start = time.time()
-                results = collection.hybrid_search(
-                    vector=query["embedding"],
-                    text_query=query["text"],
-                    k=10,
-                    alpha=0.5
-                )
-                duration_ms = (time.time() - start) * 1000
-                metrics.add_latency("hybrid_search", duration_ms)
-                
-                results_list = [{"id": r.id, "score": r.score} for r in results]
-                
-                ndcg = self.recorder.compute_ndcg(results_list, ground_truth, k=10)
-                recall = self.recorder.compute_recall(results_list, ground_truth, k=10)
-                
-                ndcg_scores.append(ndcg)
-                recall_scores.append(recall)
-            
-            metrics.ndcg_at_10 = np.mean(ndcg_scores) if ndcg_scores else 0.0
-            metrics.recall_at_10 = np.mean(recall_scores) if recall_scores else 0.0
+        metrics.ndcg_at_10 = float(ndcg_scores.mean()) if ndcg_scores.size else 0.0
+        metrics.recall_at_10 = float(recall_scores.mean()) if recall_scores.size else 0.0
         
         # Test 3: Semantic cache (paraphrase groups)
         # Note: Cache would need to be implemented in the SDK
         # For now, simulate cache testing
         metrics.cache_hit_rate = 0.65  # Simulated
         
-        print(f"  → Leakage rate: {metrics.leakage_rate:.4f}")
-        print(f"  → NDCG@10: {metrics.ndcg_at_10:.3f}")
-        print(f"  → Recall@10: {metrics.recall_at_10:.3f}")
-        print(f"  → Cache hit rate: {metrics.cache_hit_rate:.2%}")
+        self._log(f"→ Leakage rate: {metrics.leakage_rate:.4f}")
+        self._log(f"→ NDCG@10: {metrics.ndcg_at_10:.3f}")
+        self._log(f"→ Recall@10: {metrics.recall_at_10:.3f}")
+        self._log(f"→ Cache hit rate: {metrics.cache_hit_rate:.2%}")
     
     # ========================================================================
     # Scenario 2: Sales/CRM Agent
@@ -611,50 +1034,53 @@ class ScenarioRunner:
         - Rollback behavior
         - Audit completeness
         """
-        try:
-            self.db.create_namespace("crm")
-        except:
-            pass
+        self._ensure_namespace("crm")
         
         with self.db.use_namespace("crm") as ns:
             # Test atomicity using KV operations
             num_leads = 20
             atomicity_failures = 0
+            # Fixed-schema record, filled by %-formatting instead of a json.dumps per lead
+            enriched_template = '{"company": "Corp_%d", "score": %d, "status": "enriched"}'
+            # (str, bytes) key pairs built once: transactions take bytes, ns.get takes str
+            lead_keys = [(key, key.encode()) for key in (f"lead_{i}" for i in range(num_leads))]
+            
+            failed_leads = []
             
-            for i in range(num_leads):
-                lead_id = f"lead_{i}".encode()
+            for i, (lead_key, lead_id) in enumerate(lead_keys):
+                # Simulate failure for some leads: the transaction aborts
+                # before writing, so only this branch pays for try/except
+                if i % 5 == 0:
+                    try:
+                        with self.db.transaction() as txn:
+                            raise _SimulatedFailure("Simulated enrichment failure")
+                    except _SimulatedFailure:
+                        failed_leads.append(lead_key)
+                    continue
                 
-                try:
-                    start = time.time()
-                    with self.db.transaction() as txn:
-                        # Simulate failure for some leads
-                        if i % 5 == 0:
-                            raise Exception("Simulated enrichment failure")
-                        
-                        # Enrich lead
-                        enriched = json.dumps({
-                            "company": f"Corp_{i}",
-                            "score": random.randint(50, 100),
-                            "status": "enriched"
-                        }).encode()
-                        
-                        # Update via transaction
-                        txn.put(lead_id, enriched)
-                    
-                    duration_ms = (time.time() - start) * 1000
-                    metrics.add_latency("txn_commit", duration_ms)
+                start = _pc()
+                with self.db.transaction() as txn:
+                    # Enrich lead
+                    enriched = (enriched_template % (i, random.randint(50, 100))).encode()
                     
-                except Exception as e:
-                    # Rollback occurred - verify lead unchanged or doesn't exist
-                    data = ns.get(lead_id.decode())
-                    if data is not None:
-                        # Check if it has enriched status
-                        try:
-                            obj = json.loads(data.decode())
-                            if obj.get("status") == "enriched":
-                                atomicity_failures += 1
-                        except:
-                            pass
+                    # Update via transaction
+                    txn.put(lead_id, enriched)
+                
+                duration_ms = (_pc() - start) / 1_000_000
+                metrics.add_latency("txn_commit", duration_ms)
+            
+            # Rollback occurred - verify each failed lead is unchanged or doesn't exist
+            for lead_key in failed_leads:
+                data = ns.get(lead_key)
+                if data is None:
+                    continue
+                # Check if it has enriched status
+                try:
+                    obj = json.loads(data)
+                except (ValueError, UnicodeDecodeError):
+                    continue
+                if obj.get("status") == "enriched":
+                    atomicity_failures += 1
             
             metrics.atomicity_failures = atomicity_failures
             metrics.audit_coverage = 1.0  # All operations logged (simulated)
@@ -663,8 +1089,8 @@ class ScenarioRunner:
                 metrics.passed = False
                 metrics.errors.append(f"Atomicity violations: {atomicity_failures}")
             
-            print(f"  → Atomicity failures: {atomicity_failures}")
-            print(f"  → Audit coverage: {metrics.audit_coverage:.1%}")
+            self._log(f"→ Atomicity failures: {atomicity_failures}")
+            self._log(f"→ Audit coverage: {metrics.audit_coverage:.1%}")
     
     # ========================================================================
     # Scenario 3: SecOps Triage Agent
@@ -685,24 +1111,27 @@ class ScenarioRunner:
         # For now, simulate with simple data structure
         
         # Test: Incident cluster reconstruction
-        correct_clusters = 0
-        total_incidents = len(graph_data["incidents"])
-        
-        for incident in graph_data["incidents"]:
-            # Simulate traversal from alert to cluster
-            # In real implementation, would use graph.find_path or BFS
-            reconstructed_cluster = set(incident["cluster_hosts"])
-            actual_cluster = set(incident["cluster_hosts"])
-            
-            # Compute cluster F1
-            tp = len(reconstructed_cluster & actual_cluster)
-            fp = len(reconstructed_cluster - actual_cluster)
-            fn = len(actual_cluster - reconstructed_cluster)
-            
-            f1 = 2 * tp / (2 * tp + fp + fn) if (tp + fp + fn) > 0 else 0.0
-            
-            if f1 >= 0.90:
-                correct_clusters += 1
+        incidents = graph_data["incidents"]
+        total_incidents = len(incidents)
+        
+        # Clusters as (incidents x hosts) boolean masks over the host universe
+        host_idx = {host["id"]: i for i, host in enumerate(graph_data["hosts"])}
+        actual = np.zeros((total_incidents, len(host_idx)), dtype=bool)
+        for row, incident in enumerate(incidents):
+            actual[row, [host_idx[h] for h in incident["cluster_hosts"]]] = True
+        
+        # Simulate traversal from alert to cluster
+        # In real implementation, would use graph.find_path or BFS
+        reconstructed = actual.copy()
+        
+        # Compute cluster F1 for every incident at once
+        tp = (reconstructed & actual).sum(axis=1)
+        fp = (reconstructed & ~actual).sum(axis=1)
+        fn = (~reconstructed & actual).sum(axis=1)
+        
+        denom = 2 * tp + fp + fn
+        f1 = np.divide(2 * tp, denom, out=np.zeros(total_incidents), where=denom > 0)
+        correct_clusters = int((f1 >= 0.90).sum())
         
         cluster_accuracy = correct_clusters / total_incidents if total_incidents > 0 else 0.0
         
@@ -715,8 +1144,8 @@ class ScenarioRunner:
             metrics.passed = False
             metrics.errors.append(f"Cluster accuracy below threshold: {cluster_accuracy:.2%}")
         
-        print(f"  → Cluster reconstruction accuracy: {cluster_accuracy:.1%}")
-        print(f"  → Temporal correctness: {temporal_correct:.1%}")
+        self._log(f"→ Cluster reconstruction accuracy: {cluster_accuracy:.1%}")
+        self._log(f"→ Temporal correctness: {temporal_correct:.1%}")
     
     # ========================================================================
     # Scenario 4: On-call Runbook Agent
@@ -731,58 +1160,27 @@ class ScenarioRunner:
         - Context budget compliance
         - Cache effectiveness
         """
-        try:
-            self.db.create_namespace("oncall")
-        except:
-            pass
+        self._ensure_namespace("oncall")
         
         with self.db.use_namespace("oncall") as ns:
             # Create runbooks collection
-            collection = ns.create_collection(
-                "runbooks",
+            collection = self._ensure_collection(
+                ns, "oncall", "runbooks",
                 dimension=self.generator.embedding_dim,
                 enable_hybrid_search=True
             )
             
             # Insert runbooks
-            runbooks = self.generator.generate_collection_docs("oncall", "runbook", num_docs=100)
-            for doc in runbooks:
-                collection.insert(
-                    id=doc["id"],
-                    vector=doc["embedding"],
-                    metadata=doc["metadata"],
-                    content=doc["content"]
-                )
+            runbooks = self.generator.generate_doc_batch("oncall", "runbook", num_docs=100)
+            self._bulk_insert(collection, runbooks.records())
             
             # Test retrieval accuracy
             queries = self.generator.generate_queries("oncall", "runbook", num_queries=20)
             
-            top1_correct = 0
-            top3_correct = 0
-            
-            for query in queries:
-                ground_truth = [
-                    doc["id"] for doc in runbooks
-                    if doc["topic_id"] == query["topic_id"]
-                ]
-                
-                results = collection.hybrid_search(
-                    vector=query["embedding"],
-                    text_query=query["text"],
-                    k=10
-                )
-                
-                # Top-1
-                if results and results[0].id in ground_truth:
-                    top1_correct += 1
-                
-                # Top-3
-                top3_ids = [r.id for r in results[:3]]
-                if any(doc_id in ground_truth for doc_id in top3_ids):
-                    top3_correct += 1
+            evaluation = self._eval_hybrid_queries(collection, queries, runbooks, k=10)
             
-            top1_accuracy = top1_correct / len(queries)
-            top3_accuracy = top3_correct / len(queries)
+            top1_accuracy = float(evaluation.top1.mean())
+            top3_accuracy = float(evaluation.top3.mean())
             
             metrics.recall_at_10 = top3_accuracy
             
@@ -790,8 +1188,8 @@ class ScenarioRunner:
                 metrics.passed = False
                 metrics.errors.append(f"Top-1 accuracy below threshold: {top1_accuracy:.2%}")
             
-            print(f"  → Top-1 accuracy: {top1_accuracy:.1%}")
-            print(f"  → Top-3 accuracy: {top3_accuracy:.1%}")
+            self._log(f"→ Top-1 accuracy: {top1_accuracy:.1%}")
+            self._log(f"→ Top-3 accuracy: {top3_accuracy:.1%}")
     
     # ========================================================================
     # Scenario 5: Memory-building Research Agent (Crash Safety)
@@ -810,40 +1208,33 @@ class ScenarioRunner:
         # For now, simulate consistency checks
         
         num_memories = 50
-        consistency_failures = 0
         
-        try:
-            self.db.create_namespace("research")
-        except:
-            pass
+        self._ensure_namespace("research")
         
         with self.db.use_namespace("research") as ns:
-            collection = ns.create_collection(
-                "memories",
+            collection = self._ensure_collection(
+                ns, "research", "memories",
                 dimension=self.generator.embedding_dim
             )
             
-            for i in range(num_memories):
-                memory_id = f"memory_{i}"
-                embedding = self.generator.generate_embedding(i % self.generator.num_topics)
-                
-                # Simulate crash on some writes
-                if i % 10 == 0:
-                    # Partial write - should be recovered
-                    # In real implementation, would test WAL replay
-                    pass
-                
-                # Write atomically
-                collection.insert(
-                    id=memory_id,
-                    vector=embedding,
-                    metadata={"type": "memory", "index": i}
-                )
-                
-                # Verify consistency
-                retrieved = collection.get(memory_id)
-                if retrieved is None:
-                    consistency_failures += 1
+            # Build every payload up front so the write/verify phase is pure I/O
+            memory_ids = [f"memory_{i}" for i in range(num_memories)]
+            embeddings = self.generator.generate_embeddings_batch(
+                np.arange(num_memories) % self.generator.num_topics
+            ).astype(np.float32)
+            metadatas = [{"type": "memory", "index": i} for i in range(num_memories)]
+            records = list(zip(memory_ids, embeddings.tolist(), metadatas, [None] * num_memories))
+            
+            # Simulate crash on some writes (every 10th would be a partial
+            # write recovered by WAL replay in a real implementation)
+            
+            # Write atomically, as one batch
+            self._bulk_insert(collection, records)
+            
+            # Verify consistency
+            consistency_failures = sum(
+                1 for retrieved in map(collection.get, memory_ids) if retrieved is None
+            )
         
         metrics.consistency_failures = consistency_failures
         
@@ -851,8 +1242,8 @@ class ScenarioRunner:
             metrics.passed = False
             metrics.errors.append(f"Consistency failures after recovery: {consistency_failures}")
         
-        print(f"  → Consistency failures: {consistency_failures}")
-        print(f"  → Recovery replays: {0}")  # Simulated
+        self._log(f"→ Consistency failures: {consistency_failures}")
+        self._log(f"→ Recovery replays: {0}")  # Simulated
     
     # ========================================================================
     # Scenario 6: Finance Close Agent
@@ -867,10 +1258,7 @@ class ScenarioRunner:
         - Transaction conflict handling
         - Retry logic
         """
-        try:
-            self.db.create_namespace("finance")
-        except:
-            pass
+        self._ensure_namespace("finance")
         
         with self.db.use_namespace("finance") as ns:
             # Use KV operations for ledger
@@ -879,8 +1267,14 @@ class ScenarioRunner:
             conflicts = 0
             retries = []
             
-            for i in range(num_invoices):
-                invoice_id = f"ledger/inv_{i}".encode()
+            # One posting timestamp per close batch; entries are %-formatted
+            # into a fixed-schema JSON template instead of json.dumps per invoice
+            posted_at = datetime.now().isoformat()
+            entry_template = '{"amount": %r, "status": "posted", "posted_at": "%s"}'
+            
+            invoice_ids = [b"ledger/inv_%d" % i for i in range(num_invoices)]
+            
+            for invoice_id in invoice_ids:
                 amount = random.uniform(100, 10000)
                 
                 retry_count = 0
@@ -888,7 +1282,7 @@ class ScenarioRunner:
                 
                 while retry_count < max_retries:
                     try:
-                        start = time.time()
+                        start = _pc()
                         with self.db.transaction() as txn:
                             # Check for existing entry
                             existing = txn.get(invoice_id)
@@ -898,15 +1292,11 @@ class ScenarioRunner:
                                 break
                             
                             # Insert
-                            ledger_entry = json.dumps({
-                                "amount": amount,
-                                "status": "posted",
-                                "posted_at": datetime.now().isoformat()
-                            }).encode()
+                            ledger_entry = (entry_template % (amount, posted_at)).encode()
                             
                             txn.put(invoice_id, ledger_entry)
                         
-                        duration_ms = (time.time() - start) * 1000
+                        duration_ms = (_pc() - start) / 1_000_000
                         metrics.add_latency("ledger_commit", duration_ms)
                         retries.append(retry_count)
                         break
@@ -914,7 +1304,10 @@ class ScenarioRunner:
                     except TransactionConflictError:
                         conflicts += 1
                         retry_count += 1
-                        time.sleep(0.01 * retry_count)  # Exponential backoff
+                        # Full-jitter exponential backoff, capped at 50ms. The
+                        # next attempt restarts the ledger_commit clock, so the
+                        # sleep never counts toward commit latency.
+                        time.sleep(random.random() * min(0.01 * (1 << retry_count), 0.05))
             
             metrics.atomicity_failures = double_posts
             metrics.conflict_rate = conflicts / num_invoices if num_invoices > 0 else 0.0
@@ -924,9 +1317,9 @@ class ScenarioRunner:
                 metrics.passed = False
                 metrics.errors.append(f"Double-post detected: {double_posts}")
             
-            print(f"  → Double-posts: {double_posts}")
-            print(f"  → Conflict rate: {metrics.conflict_rate:.2%}")
-            print(f"  → Avg retries: {metrics.avg_retries:.2f}")
+            self._log(f"→ Double-posts: {double_posts}")
+            self._log(f"→ Conflict rate: {metrics.conflict_rate:.2%}")
+            self._log(f"→ Avg retries: {metrics.avg_retries:.2f}")
     
     # ========================================================================
     # Scenario 7: Compliance Agent
@@ -940,28 +1333,19 @@ class ScenarioRunner:
         - Policy evaluation accuracy
         - Deny explainability
         """
-        # Simulate policy checks
+        # Simulate policy checks: all access requests drawn at once
         num_requests = 100
-        correct_decisions = 0
-        explainable_denies = 0
-        total_denies = 0
+        allowed = self.rng.integers(0, 2, size=num_requests, dtype=bool)
         
-        for i in range(num_requests):
-            # Simulate access request
-            allowed = random.choice([True, False])
-            
-            # Check policy
-            policy_decision = allowed  # Simulated perfect policy
-            
-            if policy_decision == allowed:
-                correct_decisions += 1
-            
-            if not allowed:
-                total_denies += 1
-                # Check for explanation
-                has_explanation = True  # Simulated
-                if has_explanation:
-                    explainable_denies += 1
+        # Check policy
+        policy_decision = allowed  # Simulated perfect policy
+        correct_decisions = int((policy_decision == allowed).sum())
+        
+        denied = ~allowed
+        total_denies = int(denied.sum())
+        # Check for explanation
+        has_explanation = np.ones(num_requests, dtype=bool)  # Simulated
+        explainable_denies = int((denied & has_explanation).sum())
         
         accuracy = correct_decisions / num_requests
         explainability = explainable_denies / total_denies if total_denies > 0 else 1.0
@@ -970,8 +1354,8 @@ class ScenarioRunner:
             metrics.passed = False
             metrics.errors.append(f"Policy accuracy below 100%: {accuracy:.1%}")
         
-        print(f"  → Policy accuracy: {accuracy:.1%}")
-        print(f"  → Deny explainability: {explainability:.1%}")
+        self._log(f"→ Policy accuracy: {accuracy:.1%}")
+        self._log(f"→ Deny explainability: {explainability:.1%}")
     
     # ========================================================================
     # Scenario 8: Procurement Agent
@@ -986,55 +1370,31 @@ class ScenarioRunner:
         - Graph linkage accuracy
         - Atomic writes with crash safety
         """
-        try:
-            self.db.create_namespace("procurement")
-        except:
-            pass
+        self._ensure_namespace("procurement")
         
         with self.db.use_namespace("procurement") as ns:
-            collection = ns.create_collection(
-                "clauses",
+            collection = self._ensure_collection(
+                ns, "procurement", "clauses",
                 dimension=self.generator.embedding_dim,
                 enable_hybrid_search=True
             )
             
             # Insert contract clauses
-            clauses = self.generator.generate_collection_docs("procurement", "contract", num_docs=100)
-            for doc in clauses:
-                collection.insert(
-                    id=doc["id"],
-                    vector=doc["embedding"],
-                    metadata=doc["metadata"],
-                    content=doc["content"]
-                )
+            clauses = self.generator.generate_doc_batch("procurement", "contract", num_docs=100)
+            self._bulk_insert(collection, clauses.records())
             
             # Test clause retrieval
             queries = self.generator.generate_queries("procurement", "contract", num_queries=20)
             
-            recall_scores = []
-            for query in queries:
-                ground_truth = [
-                    doc["id"] for doc in clauses
-                    if doc["topic_id"] == query["topic_id"]
-                ]
-                
-                results = collection.hybrid_search(
-                    vector=query["embedding"],
-                    text_query=query["text"],
-                    k=10
-                )
-                
-                results_list = [{"id": r.id} for r in results]
-                recall = self.recorder.compute_recall(results_list, ground_truth, k=10)
-                recall_scores.append(recall)
+            recall_scores = self._eval_hybrid_queries(collection, queries, clauses, k=10).recall
             
-            metrics.recall_at_10 = np.mean(recall_scores) if recall_scores else 0.0
+            metrics.recall_at_10 = float(recall_scores.mean()) if recall_scores.size else 0.0
             
             if metrics.recall_at_10 < 0.85:
                 metrics.passed = False
                 metrics.errors.append(f"Recall below threshold: {metrics.recall_at_10:.2%}")
             
-            print(f"  → Clause Recall@10: {metrics.recall_at_10:.1%}")
+            self._log(f"→ Clause Recall@10: {metrics.recall_at_10:.1%}")
     
     # ========================================================================
     # Scenario 9: Edge Field-Tech Agent
@@ -1050,16 +1410,15 @@ class ScenarioRunner:
         - TTL effectiveness
         """
         # This scenario emphasizes embedded mode
-        print(f"  → Mode: {self.mode}")
+        self._log(f"→ Mode: {self.mode}")
         
         # Simulate temporal queries
         num_queries = 20
-        correct_states = 0
         
-        for i in range(num_queries):
-            # Simulate time-travel query
-            # In real implementation, would use temporal graph APIs
-            correct_states += 1  # Simulated perfect time-travel
+        # Simulate time-travel queries
+        # In real implementation, would use temporal graph APIs
+        state_correct = np.ones(num_queries, dtype=bool)  # Simulated perfect time-travel
+        correct_states = int(state_correct.sum())
         
         temporal_accuracy = correct_states / num_queries
         
@@ -1069,7 +1428,7 @@ class ScenarioRunner:
             metrics.passed = False
             metrics.errors.append(f"Temporal accuracy below 100%: {temporal_accuracy:.1%}")
         
-        print(f"  → Temporal accuracy: {temporal_accuracy:.1%}")
+        self._log(f"→ Temporal accuracy: {temporal_accuracy:.1%}")
     
     # ========================================================================
     # Scenario 10: Tool-using Agent via MCP
@@ -1085,18 +1444,13 @@ class ScenarioRunner:
         - Context correctness
         """
         num_tool_calls = 50
-        successful_calls = 0
-        schema_valid = 0
-        
-        for i in range(num_tool_calls):
-            # Simulate tool call
-            try:
-                # In real implementation, would call MCP tools
-                result = {"status": "success", "data": {}}
-                successful_calls += 1
-                schema_valid += 1
-            except Exception as e:
-                pass
+        
+        # Simulate tool calls
+        # In real implementation, would call MCP tools and validate each result
+        call_succeeded = np.ones(num_tool_calls, dtype=bool)
+        schema_ok = call_succeeded.copy()
+        successful_calls = int(call_succeeded.sum())
+        schema_valid = int(schema_ok.sum())
         
         success_rate = successful_calls / num_tool_calls
         schema_validation_rate = schema_valid / num_tool_calls
@@ -1107,8 +1461,8 @@ class ScenarioRunner:
             metrics.passed = False
             metrics.errors.append(f"Tool call success rate below 99.9%: {success_rate:.2%}")
         
-        print(f"  → Tool call success rate: {success_rate:.1%}")
-        print(f"  → Schema validation rate: {schema_validation_rate:.1%}")
+        self._log(f"→ Tool call success rate: {success_rate:.1%}")
+        self._log(f"→ Schema validation rate: {schema_validation_rate:.1%}")
 
 
 # ============================================================================
@@ -1124,36 +1478,42 @@ class ScorecardAggregator:
     
     def generate_scorecard(self) -> Dict[str, Any]:
         """Generate comprehensive scorecard."""
+        scenarios = self.recorder.scenarios
         scenario_scores = {}
+        # Merge per-scenario histograms, then read every op type's p95 at once
+        all_latencies: Dict[str, np.ndarray] = {}
+        passed_scenarios = 0
+        failed_checks = []
         
-        for scenario_id, metrics in self.recorder.scenarios.items():
+        # One pass: scores, latency merge, pass count and failed checks
+        for scenario_id, metrics in scenarios.items():
             scenario_scores[scenario_id] = {
                 "pass": metrics.passed,
                 "metrics": metrics.to_dict()
             }
-        
-        # Compute global metrics
-        all_latencies = defaultdict(list)
-        for metrics in self.recorder.scenarios.values():
             for op_type, latencies in metrics.latencies.items():
-                all_latencies[op_type].extend(latencies)
+                if len(latencies):
+                    merged = all_latencies.get(op_type)
+                    if merged is None:
+                        all_latencies[op_type] = latencies.counts.astype(np.uint64)
+                    else:
+                        merged += latencies.counts
+            if metrics.passed:
+                passed_scenarios += 1
+            else:
+                failed_checks.extend([f"{scenario_id}: {err}" for err in metrics.errors])
         
-        p95_latencies = {}
-        for op_type, latencies in all_latencies.items():
-            if latencies:
-                p95_latencies[op_type] = float(np.percentile(latencies, 95))
+        # Compute global metrics
+        p95_latencies = dict(zip(
+            all_latencies,
+            LatencyHistogram.p95_of(np.stack(list(all_latencies.values()))).tolist(),
+        )) if all_latencies else {}
         
         # Compute overall pass/fail
-        total_scenarios = len(self.recorder.scenarios)
-        passed_scenarios = sum(1 for m in self.recorder.scenarios.values() if m.passed)
+        total_scenarios = len(scenarios)
         overall_pass = passed_scenarios == total_scenarios
         score = (passed_scenarios / total_scenarios * 100) if total_scenarios > 0 else 0.0
         
-        failed_checks = []
-        for scenario_id, metrics in self.recorder.scenarios.items():
-            if not metrics.passed:
-                failed_checks.extend([f"{scenario_id}: {err}" for err in metrics.errors])
-        
         scorecard = {
             "run_meta": self.run_meta,
             "scenario_scores": scenario_scores,
@@ -1173,44 +1533,52 @@ class ScorecardAggregator:
         return scorecard
     
     def print_summary_table(self, scorecard: Dict[str, Any]):
-        """Print summary table."""
-        print(f"\n{'='*80}")
-        print(f"SCORECARD SUMMARY")
-        print(f"{'='*80}\n")
-        
-        print(f"Run Meta:")
-        print(f"  Seed: {scorecard['run_meta']['seed']}")
-        print(f"  Scale: {scorecard['run_meta']['scale']}")
-        print(f"  Mode: {scorecard['run_meta']['mode']}")
-        print(f"  Duration: {scorecard['run_meta']['duration_s']:.2f}s")
-        
-        print(f"\nOverall Score: {scorecard['overall']['score_0_100']:.1f}/100")
-        print(f"  Passed: {scorecard['overall']['passed_scenarios']}/{scorecard['overall']['total_scenarios']}")
-        print(f"  Status: {'✓ PASS' if scorecard['overall']['pass'] else '✗ FAIL'}")
-        
-        print(f"\n{'Scenario':<40} {'Status':<10} {'NDCG@10':<10} {'Recall@10':<10}")
-        print(f"{'-'*70}")
+        """Print summary table (buffered, written to stdout in one call)."""
+        run_meta = scorecard['run_meta']
+        overall = scorecard['overall']
+        row = "{:<40} {:<10} {:<10} {:<10}\n".format
+        
+        out = [
+            f"\n{'='*80}\n",
+            f"SCORECARD SUMMARY\n",
+            f"{'='*80}\n\n",
+            f"Run Meta:\n",
+            f"  Seed: {run_meta['seed']}\n",
+            f"  Scale: {run_meta['scale']}\n",
+            f"  Mode: {run_meta['mode']}\n",
+            f"  Duration: {run_meta['duration_s']:.2f}s\n",
+            f"\nOverall Score: {overall['score_0_100']:.1f}/100\n",
+            f"  Passed: {overall['passed_scenarios']}/{overall['total_scenarios']}\n",
+            f"  Status: {'✓ PASS' if overall['pass'] else '✗ FAIL'}\n",
+            "\n" + row('Scenario', 'Status', 'NDCG@10', 'Recall@10'),
+            f"{'-'*70}\n",
+        ]
         
         for scenario_id, score in scorecard['scenario_scores'].items():
             status = '✓ PASS' if score['pass'] else '✗ FAIL'
-            ndcg = score['metrics']['retrieval']['ndcg_at_10']
-            recall = score['metrics']['retrieval']['recall_at_10']
+            retrieval = score['metrics']['retrieval']
+            ndcg = retrieval['ndcg_at_10']
+            recall = retrieval['recall_at_10']
             
             ndcg_str = f"{ndcg:.3f}" if ndcg is not None else "N/A"
             recall_str = f"{recall:.3f}" if recall is not None else "N/A"
             
-            print(f"{scenario_id:<40} {status:<10} {ndcg_str:<10} {recall_str:<10}")
-        
-        if scorecard['overall']['failed_checks']:
-            print(f"\nFailed Checks:")
-            for check in scorecard['overall']['failed_checks']:
-                print(f"  ✗ {check}")
-        
-        print(f"\nGlobal P95 Latencies (ms):")
-        for op_type, latency in scorecard['global_metrics']['p95_latency_ms'].items():
-            print(f"  {op_type}: {latency:.2f}ms")
-        
-        print(f"\n{'='*80}\n")
+            out.append(row(scenario_id, status, ndcg_str, recall_str))
+        
+        failed_checks = overall['failed_checks']
+        if failed_checks:
+            out.append(f"\nFailed Checks:\n")
+            out.extend(f"  ✗ {check}\n" for check in failed_checks)
+        
+        out.append(f"\nGlobal P95 Latencies (ms):\n")
+        out.extend(
+            f"  {op_type}: {latency:.2f}ms\n"
+            for op_type, latency in scorecard['global_metrics']['p95_latency_ms'].items()
+        )
+        
+        out.append(f"\n{'='*80}\n\n")
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
 
 
 # ============================================================================
@@ -1226,13 +1594,22 @@ def main():
     parser.add_argument("--scale", choices=["small", "medium", "large"], default="medium", help="Test scale")
     parser.add_argument("--mode", choices=["embedded", "server"], default="embedded", help="DB mode")
     parser.add_argument("--output", default="scorecard.json", help="Output JSON file")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Scenarios run concurrently (>1 trades seeded reproducibility for speed)",
+    )
+    parser.add_argument(
+        "--search-workers", type=int, default=1,
+        help="In-flight searches per query batch (>1 adds thread contention to latencies)",
+    )
     
     args = parser.parse_args()
     
-    # Clean up old test data
-    test_db_path = Path("./test_harness_db")
-    if test_db_path.exists():
-        shutil.rmtree(test_db_path)
+    # Fresh throwaway DB directory, RAM-backed (tmpfs) when available
+    shm = "/dev/shm"
+    test_db_path = Path(tempfile.mkdtemp(
+        prefix="test_harness_db_", dir=shm if os.path.isdir(shm) else None
+    ))
     
     # Initialize components
     print("Initializing test harness...")
@@ -1244,38 +1621,47 @@ def main():
     # Initialize database
     db = Database.open(str(test_db_path))
     
-    # Run scenarios
-    runner = ScenarioRunner(db, generator, recorder, mode=args.mode)
-    scenarios = runner.run_all()
-    
-    duration_s = time.time() - start_time
-    
-    # Generate scorecard
-    run_meta = {
-        "seed": args.seed,
-        "scale": args.scale,
-        "mode": args.mode,
-        "sdk_version": "0.3.3",
-        "started_at": datetime.now().isoformat(),
-        "duration_s": duration_s,
-    }
-    
-    aggregator = ScorecardAggregator(recorder, run_meta)
-    scorecard = aggregator.generate_scorecard()
-    
-    # Save scorecard
-    output_path = Path(args.output)
-    with open(output_path, "w") as f:
-        json.dump(scorecard, f, indent=2)
-    
-    print(f"\n✓ Scorecard saved to: {output_path}")
-    
-    # Print summary table
-    aggregator.print_summary_table(scorecard)
-    
-    # Cleanup
-    db.close()
-    shutil.rmtree(test_db_path)
+    try:
+        # Run scenarios
+        runner = ScenarioRunner(
+            db, generator, recorder, mode=args.mode, search_workers=args.search_workers
+        )
+        scenarios = runner.run_all(max_workers=args.workers)
+        
+        duration_s = time.time() - start_time
+        
+        # Generate scorecard
+        run_meta = {
+            "seed": args.seed,
+            "scale": args.scale,
+            "mode": args.mode,
+            "workers": args.workers,
+            "search_workers": args.search_workers,
+            "sdk_version": "0.3.3",
+            "started_at": datetime.now().isoformat(),
+            "duration_s": duration_s,
+        }
+        
+        aggregator = ScorecardAggregator(recorder, run_meta)
+        scorecard = aggregator.generate_scorecard()
+        
+        # Save scorecard
+        output_path = Path(args.output)
+        if orjson is not None:
+            output_path.write_bytes(
+                orjson.dumps(scorecard, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+            )
+        else:
+            output_path.write_text(json.dumps(scorecard, indent=2))
+        
+        print(f"\n✓ Scorecard saved to: {output_path}")
+        
+        # Print summary table
+        aggregator.print_summary_table(scorecard)
+    finally:
+        # Cleanup
+        db.close()
+        shutil.rmtree(test_db_path, ignore_errors=True)
     
     return 0 if scorecard['overall']['pass'] else 1
 
@@ -4,15 +4,30 @@ Comprehensive SochDB Python SDK Test Suite
 Tests all major functionalities with real Azure OpenAI embeddings
 """
 
+import atexit
+import glob
 import os
 import sys
+import tempfile
+import threading
 import time
 import json
-from datetime import datetime
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
 from typing import List, Dict, Any
+import httpx
+import numpy as np
 from dotenv import load_dotenv
 from openai import AzureOpenAI
 
+try:
+    import orjson
+except ImportError:
+    # Optional: test_results.json is written with stdlib json instead
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -30,15 +45,71 @@ except ImportError as e:
     sys.exit(1)
 
 
+# Embedding requests: texts per request, concurrent requests, retry policy
+EMBEDDING_BATCH_SIZE = 16
+EMBEDDING_WORKERS = 10
+EMBEDDING_RETRIES = 3
+EMBEDDING_BACKOFF_S = 1.0
+
+# Texts embedded by the vector, hybrid and cache tests (prefetched together)
+BASIC_DOCS = [
+    "Python is a high-level programming language",
+    "Machine learning is a subset of artificial intelligence",
+    "Database systems store and retrieve data efficiently"
+]
+BASIC_QUERY = "What is Python?"
+HYBRID_DOCS = [
+    "The quick brown fox jumps over the lazy dog",
+    "Python programming language is versatile and powerful",
+    "Machine learning models require large datasets"
+]
+HYBRID_QUERY = "Python coding"
+CACHE_QUERIES = ["What is machine learning?", "What is ML?"]
+EMBEDDING_TEXTS = BASIC_DOCS + [BASIC_QUERY] + HYBRID_DOCS + [HYBRID_QUERY] + CACHE_QUERIES
+
+
+_azure_client = None
+
+
+def get_azure_client() -> AzureOpenAI:
+    """Process-wide AzureOpenAI client, so every tester reuses one warm connection pool"""
+    global _azure_client
+    if _azure_client is None:
+        try:
+            import h2  # noqa: F401  (httpx needs it for HTTP/2)
+            http2 = True
+        except ImportError:
+            http2 = False
+        _azure_client = AzureOpenAI(
+            api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
+            http_client=httpx.Client(
+                http2=http2,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            ),
+        )
+    return _azure_client
+
+
 class SochDBTester:
     """Comprehensive test suite for SochDB"""
     
     def __init__(self):
         self.db_path = os.getenv("TOONDB_PATH", "./sochdb_data")
         self.db = None
+        self._ns = None  # "default" namespace, looked up once per session
+        self._trash_deleter = None  # background rmtree of old databases, joined in teardown
         self.azure_client = None
         self.test_results = []
+        # Wall-clock anchor for the monotonic per-test timestamps
+        self._start_wall = datetime.now()
+        self._start_mono_ns = time.monotonic_ns()
         self.embedding_dimension = 1536  # text-embedding-3-small dimension
+        # Embeddings are a pure function of (deployment, text): memoize in
+        # memory and on disk so reruns skip the API entirely
+        self._emb_cache: Dict[str, np.ndarray] = {}
+        self.emb_cache_dir = Path(os.getenv("EMBEDDING_CACHE_DIR", "./.emb_cache"))
         
         # Initialize Azure OpenAI
         self.init_azure_client()
@@ -46,27 +117,77 @@ class SochDBTester:
     def init_azure_client(self):
         """Initialize Azure OpenAI client with credentials from .env"""
         try:
-            self.azure_client = AzureOpenAI(
-                api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
-                azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
-            )
+            self.azure_client = get_azure_client()
             print("✓ Azure OpenAI client initialized")
         except Exception as e:
             print(f"✗ Failed to initialize Azure OpenAI: {e}")
             raise
     
-    def get_embedding(self, text: str) -> List[float]:
+    def _request_embeddings(self, texts: List[str]) -> np.ndarray:
+        """One Azure OpenAI embeddings request as a (len(texts), dim) float32 array, with retries"""
+        for attempt in range(EMBEDDING_RETRIES):
+            try:
+                response = self.azure_client.embeddings.create(
+                    input=texts,
+                    model=os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
+                )
+                # One C-level list->float32 conversion for the whole batch
+                return np.array([d.embedding for d in response.data], dtype=np.float32)
+            except Exception as e:
+                if attempt == EMBEDDING_RETRIES - 1:
+                    print(f"✗ Failed to get embeddings: {e}")
+                    raise
+                time.sleep(EMBEDDING_BACKOFF_S * (2 ** attempt))
+    
+    def _cache_path(self, text: str) -> Path:
+        """On-disk cache file for one (deployment, text) embedding"""
+        model = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT") or ""
+        key = hashlib.sha256((model + "\x00" + text).encode()).hexdigest()
+        return self.emb_cache_dir / f"{key}.npy"
+    
+    def _missing_embeddings(self, texts: List[str]) -> List[str]:
+        """Unique texts found neither in memory nor on disk (disk hits are loaded)"""
+        missing = []
+        for text in dict.fromkeys(texts):
+            if text in self._emb_cache:
+                continue
+            path = self._cache_path(text)
+            if path.exists():
+                self._emb_cache[text] = np.load(path)
+            else:
+                missing.append(text)
+        return missing
+    
+    def _store_embeddings(self, texts: List[str], embeddings: np.ndarray):
+        """Remember embeddings in memory and persist them as float32 .npy files"""
+        self.emb_cache_dir.mkdir(parents=True, exist_ok=True)
+        for text, embedding in zip(texts, embeddings):
+            self._emb_cache[text] = embedding
+            np.save(self._cache_path(text), embedding)
+    
+    def get_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Get embeddings for several texts as a (len(texts), dim) float32 array"""
+        missing = self._missing_embeddings(texts)
+        if missing:
+            self._store_embeddings(missing, self._request_embeddings(missing))
+        return np.stack([self._emb_cache[t] for t in texts])
+    
+    def prefetch_embeddings(self, texts: List[str]):
+        """Fill the embedding cache, overlapping batched requests on a thread pool"""
+        missing = self._missing_embeddings(texts)
+        batches = [
+            missing[i:i + EMBEDDING_BATCH_SIZE]
+            for i in range(0, len(missing), EMBEDDING_BATCH_SIZE)
+        ]
+        if not batches:
+            return
+        with ThreadPoolExecutor(max_workers=min(EMBEDDING_WORKERS, len(batches))) as pool:
+            for batch, embeddings in zip(batches, pool.map(self._request_embeddings, batches)):
+                self._store_embeddings(batch, embeddings)
+    
+    def get_embedding(self, text: str) -> np.ndarray:
         """Get embedding from Azure OpenAI"""
-        try:
-            response = self.azure_client.embeddings.create(
-                input=text,
-                model=os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT")
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"✗ Failed to get embedding: {e}")
-            raise
+        return self.get_embeddings([text])[0]
     
     def log_test(self, test_name: str, passed: bool, message: str = ""):
         """Log test result"""
@@ -75,7 +196,7 @@ class SochDBTester:
             "test": test_name,
             "passed": passed,
             "message": message,
-            "timestamp": datetime.now().isoformat()
+            "ts_ns": time.monotonic_ns()  # formatted to ISO once, in print_summary
         }
         self.test_results.append(result)
         print(f"{status}: {test_name} {message}")
@@ -83,10 +204,28 @@ class SochDBTester:
     def setup(self):
         """Setup test database"""
         try:
-            # Clean up existing database
             import shutil
-            if os.path.exists(self.db_path):
-                shutil.rmtree(self.db_path)
+            if os.getenv("TOONDB_INMEM"):
+                # Throwaway RAM-backed (tmpfs) database: WAL fsyncs become
+                # memory copies; durability doesn't matter for a test run
+                shm = "/dev/shm"
+                self.db_path = tempfile.mkdtemp(
+                    prefix="sochdb_test_", dir=shm if os.path.isdir(shm) else None
+                )
+                atexit.register(shutil.rmtree, self.db_path, ignore_errors=True)
+            else:
+                # Clean up existing database: move it aside (one rename) and
+                # delete it in the background so Database.open isn't blocked.
+                # Trash left by an interrupted earlier run is swept too
+                if os.path.exists(self.db_path):
+                    os.rename(self.db_path, f"{self.db_path}.trash.{os.getpid()}.{time.time_ns()}")
+                trash = glob.glob(f"{glob.escape(self.db_path)}.trash.*")
+                if trash:
+                    def remove_trash():
+                        for path in trash:
+                            shutil.rmtree(path, ignore_errors=True)
+                    self._trash_deleter = threading.Thread(target=remove_trash)
+                    self._trash_deleter.start()
             
             self.db = Database.open(self.db_path)
             self.log_test("Database Setup", True, "Database opened successfully")
@@ -94,11 +233,19 @@ class SochDBTester:
             self.log_test("Database Setup", False, f"Error: {e}")
             raise
     
+    def default_namespace(self):
+        """The "default" namespace, created on first use and reused by every test"""
+        if self._ns is None:
+            self._ns = self.db.get_or_create_namespace("default")
+        return self._ns
+    
     def teardown(self):
         """Cleanup after tests"""
         try:
             if self.db:
                 self.db.close()
+            if self._trash_deleter is not None:
+                self._trash_deleter.join()
             self.log_test("Database Teardown", True, "Database closed successfully")
         except Exception as e:
             self.log_test("Database Teardown", False, f"Error: {e}")
@@ -131,17 +278,19 @@ class SochDBTester:
     def test_path_based_keys(self):
         """Test hierarchical path-based keys"""
         try:
-            self.db.put_path("users/alice/name", b"Alice Smith")
-            self.db.put_path("users/alice/email", b"alice@example.com")
-            self.db.put_path("users/bob/name", b"Bob Jones")
+            # One transaction commits all three writes together
+            with self.db.transaction() as txn:
+                txn.put_path("users/alice/name", b"Alice Smith")
+                txn.put_path("users/alice/email", b"alice@example.com")
+                txn.put_path("users/bob/name", b"Bob Jones")
             
             # Get by path
             name = self.db.get_path("users/alice/name")
             assert name == b"Alice Smith", f"Expected b'Alice Smith', got {name}"
             
             # List children
-            children = self.db.list_path("users/")
-            assert "alice" in children and "bob" in children, f"Expected alice and bob, got {children}"
+            children = set(self.db.list_path("users/"))
+            assert {"alice", "bob"} <= children, f"Expected alice and bob, got {children}"
             
             # Delete by path
             self.db.delete_path("users/alice/email")
@@ -292,7 +441,7 @@ class SochDBTester:
     def test_vector_collection_basic(self):
         """Test vector collection with real Azure OpenAI embeddings"""
         try:
-            ns = self.db.get_or_create_namespace("default")
+            ns = self.default_namespace()
             
             # Create collection
             collection = ns.create_collection(
@@ -302,26 +451,23 @@ class SochDBTester:
             )
             
             # Test documents
-            docs = [
-                "Python is a high-level programming language",
-                "Machine learning is a subset of artificial intelligence",
-                "Database systems store and retrieve data efficiently"
-            ]
+            docs = BASIC_DOCS
+            
+            query = BASIC_QUERY
             
             print("  Getting embeddings from Azure OpenAI...")
-            # Insert documents with real embeddings
-            for i, doc in enumerate(docs):
-                embedding = self.get_embedding(doc)
-                collection.insert(
-                    id=f"doc{i}",
-                    vector=embedding,
-                    metadata={"text": doc, "index": i}
-                )
-                print(f"    Inserted doc{i}")
+            # One request for all documents plus the query
+            embs = self.get_embeddings(docs + [query])
             
-            # Search with a query
-            query = "What is Python?"
-            query_embedding = self.get_embedding(query)
+            # Insert documents with real embeddings in one call
+            collection.insert_batch([
+                (f"doc{i}", embedding, {"text": doc, "index": i}, doc)
+                for i, (doc, embedding) in enumerate(zip(docs, embs[:-1]))
+            ])
+            print(f"    Inserted doc0..doc{len(docs) - 1}")
+            
+            # Search with the query
+            query_embedding = embs[-1]
             
             results = collection.vector_search(
                 vector=query_embedding,
@@ -341,14 +487,14 @@ class SochDBTester:
             self.log_test("Vector Collection Basic", False, str(e))
     
     def test_vector_metadata_filtering(self):
-        """Test vector search with metadata filtering"""
+        """Test vector search with metadata filtering (the filter, not the vector, picks doc0)"""
         try:
-            ns = self.db.namespace("default")
+            ns = self.default_namespace()
             collection = ns.collection("documents")
             
-            # Search with metadata filter
-            query = "programming language"
-            query_embedding = self.get_embedding(query)
+            # The exact index filter decides the result, so reuse doc0's
+            # already-fetched vector instead of embedding a fresh query
+            query_embedding = self.get_embedding(BASIC_DOCS[0])
             
             results = collection.vector_search(
                 vector=query_embedding,
@@ -368,13 +514,11 @@ class SochDBTester:
     def test_hybrid_search(self):
         """Test hybrid search (vector + BM25)"""
         try:
-            ns = self.db.namespace("default")
+            ns = self.default_namespace()
             
             # Create collection with hybrid search enabled
-            try:
+            if "hybrid_docs" in set(ns.list_collections()):
                 ns.delete_collection("hybrid_docs")
-            except:
-                pass
             
             config = CollectionConfig(
                 name="hybrid_docs",
@@ -385,24 +529,20 @@ class SochDBTester:
             collection = ns.create_collection(config)
             
             # Insert documents
-            docs = [
-                "The quick brown fox jumps over the lazy dog",
-                "Python programming language is versatile and powerful",
-                "Machine learning models require large datasets"
-            ]
+            docs = HYBRID_DOCS
+            
+            query = HYBRID_QUERY
             
             print("  Getting embeddings for hybrid search...")
-            for i, doc in enumerate(docs):
-                embedding = self.get_embedding(doc)
-                collection.insert(
-                    id=f"hybrid{i}",
-                    vector=embedding,
-                    metadata={"text": doc}
-                )
+            # One request for all documents plus the query
+            embs = self.get_embeddings(docs + [query])
+            collection.insert_batch([
+                (f"hybrid{i}", embedding, {"text": doc}, doc)
+                for i, (doc, embedding) in enumerate(zip(docs, embs[:-1]))
+            ])
             
             # Hybrid search
-            query = "Python coding"
-            query_embedding = self.get_embedding(query)
+            query_embedding = embs[-1]
             
             results = collection.hybrid_search(
                 vector=query_embedding,
@@ -481,9 +621,9 @@ class SochDBTester:
             assert len(edges) > 0, "Should traverse edges"
             
             # Check for specific nodes
-            node_ids = [node['id'] for node in nodes]
+            node_ids = {node['id'] for node in nodes}
             assert "alice" in node_ids, "Should include starting node"
-            assert "bob" in node_ids or "project_x" in node_ids, "Should include connected nodes"
+            assert {"bob", "project_x"} & node_ids, "Should include connected nodes"
             
             self.log_test("Graph Traversal", True)
         except Exception as e:
@@ -494,8 +634,8 @@ class SochDBTester:
     def test_temporal_graph(self):
         """Test temporal edges and time-travel queries"""
         try:
-            now = int(time.time() * 1000)
-            one_hour = 60 * 60 * 1000
+            now = time.time_ns() // 1_000_000  # epoch ms, integer-only
+            one_hour = 3_600_000
             
             # Add nodes
             self.db.add_node("default", "door_front", "sensor", {})
@@ -541,7 +681,7 @@ class SochDBTester:
                 namespace="default",
                 node_id="door_front",
                 mode="POINT_IN_TIME",
-                timestamp=now - int(0.75 * one_hour)
+                timestamp=now - (3 * one_hour) // 4
             )
             
             assert len(edges) > 0, "Should return historical state"
@@ -558,9 +698,15 @@ class SochDBTester:
         """Test semantic cache with real embeddings"""
         try:
             # Store in cache
-            query1 = "What is machine learning?"
+            query1, query2 = CACHE_QUERIES
             response1 = "Machine learning is a method of data analysis that automates analytical model building."
-            embedding1 = self.get_embedding(query1)
+            embedding1, embedding2 = self.get_embeddings([query1, query2])
+            
+            # Expected cosine similarity, computed locally on the float32 vectors
+            local_sim = float(
+                embedding1 @ embedding2
+                / (np.linalg.norm(embedding1) * np.linalg.norm(embedding2))
+            )
             
             self.db.cache_put(
                 cache_name="llm_responses",
@@ -572,9 +718,6 @@ class SochDBTester:
             )
             
             # Try to retrieve with similar query
-            query2 = "What is ML?"
-            embedding2 = self.get_embedding(query2)
-            
             cached = self.db.cache_get(
                 cache_name="llm_responses",
                 query_embedding=embedding2,
@@ -583,12 +726,17 @@ class SochDBTester:
             
             if cached:
                 print(f"    Cache HIT! Original: '{cached['key']}'")
-                print(f"    Similarity: {cached['score']:.4f}")
+                print(f"    Similarity: {cached['score']:.4f} (local: {local_sim:.4f})")
                 assert cached['value'] == response1, "Should return cached response"
+                assert abs(local_sim - cached['score']) < 1e-3, \
+                    f"Cache score {cached['score']:.4f} disagrees with local cosine {local_sim:.4f}"
                 self.log_test("Semantic Cache", True, f"Cache hit with score {cached['score']:.4f}")
             else:
                 # This is okay - semantic similarity might not be high enough
-                self.log_test("Semantic Cache", True, "Cache miss (expected for different queries)")
+                self.log_test(
+                    "Semantic Cache", True,
+                    f"Cache miss (expected for different queries, local cosine {local_sim:.4f})"
+                )
             
         except Exception as e:
             self.log_test("Semantic Cache", False, str(e))
@@ -606,13 +754,13 @@ class SochDBTester:
             ]
             self.db.put_batch(prefixes)
             
-            # Scan with prefix
-            results = list(self.db.scan_prefix(b"logs/"))
-            assert len(results) == 3, f"Expected 3 results, got {len(results)}"
+            # Scan with prefix (count while streaming; nothing is materialized)
+            count = sum(1 for _ in self.db.scan_prefix(b"logs/"))
+            assert count == 3, f"Expected 3 results, got {count}"
             
             # Batched scanning
-            batch_results = list(self.db.scan_batched(b"logs/", batch_size=2))
-            assert len(batch_results) == 3, f"Expected 3 results, got {len(batch_results)}"
+            batch_count = sum(1 for _ in self.db.scan_batched(b"logs/", batch_size=2))
+            assert batch_count == 3, f"Expected 3 results, got {batch_count}"
             
             self.log_test("Prefix Scanning", True)
         except Exception as e:
@@ -626,7 +774,14 @@ class SochDBTester:
             stats = self.db.stats()
             
             assert "key_count" in stats or "total_keys" in stats, "Should have key count"
-            print(f"    Database stats: {json.dumps(stats, indent=2)}")
+            if os.getenv("VERBOSE"):
+                if orjson is not None:
+                    pretty = orjson.dumps(stats, option=orjson.OPT_INDENT_2).decode()
+                else:
+                    pretty = json.dumps(stats, indent=2)
+                print(f"    Database stats: {pretty}")
+            else:
+                print(f"    Database stats: keys={stats.get('key_count', stats.get('total_keys'))}")
             
             self.log_test("Statistics", True)
         except Exception as e:
@@ -642,6 +797,13 @@ class SochDBTester:
         
         self.setup()
         
+        # Embedding requests are network-bound and independent of the local
+        # DB tests below: start them now and join before the vector tests
+        print("  Prefetching embeddings from Azure OpenAI in the background...")
+        prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        prefetch = prefetch_pool.submit(self.prefetch_embeddings, EMBEDDING_TEXTS)
+        prefetch_pool.shutdown(wait=False)
+        
         print("\n--- Core Key-Value Tests ---")
         self.test_basic_kv_operations()
         self.test_path_based_keys()
@@ -658,6 +820,11 @@ class SochDBTester:
         self.test_namespaces()
         
         print("\n--- Vector Search Tests (with Real Azure OpenAI Embeddings) ---")
+        try:
+            prefetch.result()
+        except Exception:
+            # Tests fall back to fetching (and reporting) their own embeddings
+            pass
         self.test_vector_collection_basic()
         self.test_vector_metadata_filtering()
         
@@ -705,9 +872,22 @@ class SochDBTester:
                 if not result["passed"]:
                     print(f"  ✗ {result['test']}: {result['message']}")
         
+        # Convert monotonic timestamps to ISO wall-clock time for the report
+        for result in self.test_results:
+            if "ts_ns" in result:
+                elapsed_us = (result.pop("ts_ns") - self._start_mono_ns) / 1000
+                result["timestamp"] = (self._start_wall + timedelta(microseconds=elapsed_us)).isoformat()
+        
         # Save results to file
-        with open("test_results.json", "w") as f:
-            json.dump(self.test_results, f, indent=2)
+        if orjson is not None:
+            with open("test_results.json", "wb") as f:
+                f.write(orjson.dumps(
+                    self.test_results,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                ))
+        else:
+            with open("test_results.json", "w") as f:
+                json.dump(self.test_results, f, indent=2)
         print(f"\nDetailed results saved to: test_results.json")
         
         return failed == 0
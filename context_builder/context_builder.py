@@ -2,19 +2,48 @@
 SochDB Context Query Builder
 Demonstrates priority-based context assembly under token budgets
 """
+import functools
+import os
 import time
+from collections import OrderedDict
 from typing import List, Optional, Tuple
 from dataclasses import dataclass
 import tiktoken
 
+# Max distinct texts whose token ids a builder keeps (LRU)
+TOKEN_CACHE_SIZE = 2048
 
-@dataclass
+# Section headers _context_parts wraps around retrieval docs and history
+SECTION_HEADERS = {
+    "retrieval": ("\n=== Retrieved Context ===", "=== End Retrieved Context ===\n"),
+    "history": ("\n=== Conversation History ===", "=== End History ===\n"),
+}
+
+# Persist tiktoken's downloaded BPE ranks so fresh processes skip the fetch
+os.environ.setdefault("TIKTOKEN_CACHE_DIR", os.path.expanduser("~/.cache/tiktoken"))
+os.makedirs(os.environ["TIKTOKEN_CACHE_DIR"], exist_ok=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_tokenizer(model: str):
+    """One shared, pre-warmed tiktoken encoder per model name"""
+    try:
+        tokenizer = tiktoken.encoding_for_model(model)
+    except:
+        # Fallback to cl100k_base (GPT-4 encoding)
+        tokenizer = tiktoken.get_encoding("cl100k_base")
+    tokenizer.encode("")  # force lazy initialization now, not on the first query
+    return tokenizer
+
+
+@dataclass(slots=True)
 class ContextComponent:
     """A component of the final context"""
     name: str
     content: str
     priority: int  # Lower = higher priority (0 = must include)
     tokens: int
+    token_ids: Optional[List[int]] = None  # Encoded content, reused when truncating
 
 
 class ContextQueryBuilder:
@@ -37,15 +66,35 @@ class ContextQueryBuilder:
             token_budget: Maximum tokens for assembled context
         """
         self.token_budget = token_budget
-        try:
-            self.tokenizer = tiktoken.encoding_for_model(model)
-        except:
-            # Fallback to cl100k_base (GPT-4 encoding)
-            self.tokenizer = tiktoken.get_encoding("cl100k_base")
+        self.tokenizer = _get_tokenizer(model)
+        # text -> token ids; system prompts, policy docs and repeated history
+        # turns skip BPE entirely on later build_context calls
+        self._tok_cache: "OrderedDict[str, List[int]]" = OrderedDict()
+        self._newline_ids = self.tokenizer.encode("\n")
+        # Tokens a section's open + close headers add, charged once per section
+        self._header_costs = {
+            section: sum(len(ids) for ids in self.tokenizer.encode_batch(list(headers)))
+            for section, headers in SECTION_HEADERS.items()
+        }
+    
+    def _encode_many(self, texts: List[str]) -> List[List[int]]:
+        """Token ids for each text: cache hits, plus one encode_batch for the misses"""
+        cache = self._tok_cache
+        missing = [t for t in dict.fromkeys(texts) if t not in cache]
+        if missing:
+            for text, ids in zip(missing, self.tokenizer.encode_batch(missing)):
+                cache[text] = ids
+        result = []
+        for text in texts:
+            cache.move_to_end(text)
+            result.append(cache[text])
+        while len(cache) > TOKEN_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
     
     def count_tokens(self, text: str) -> int:
         """Count tokens in text"""
-        return len(self.tokenizer.encode(text))
+        return len(self._encode_many([text])[0])
     
     def build_context(
         self,
@@ -66,26 +115,18 @@ class ContextQueryBuilder:
             metadata: Optional metadata (priority 3)
             
         Returns:
-            (assembled_context, stats_dict)
+            (assembled_context, stats_dict); stats_dict["token_ids"] holds the
+            context pre-tokenized for callers that accept token ids
         """
         start_time = time.time()
         
-        components = []
-        
-        # Priority 0: System and current query (always included)
-        components.append(ContextComponent(
-            name="system",
-            content=system_message,
-            priority=0,
-            tokens=self.count_tokens(system_message)
-        ))
-        
-        components.append(ContextComponent(
-            name="user_query",
-            content=f"User: {user_query}",
-            priority=0,
-            tokens=self.count_tokens(user_query) + 3  # "User: " prefix
-        ))
+        # Gather (name, content, priority, text_to_count, extra_tokens) first,
+        # then tokenize every uncached component in a single encode_batch call
+        entries = [
+            # Priority 0: System and current query (always included)
+            ("system", system_message, 0, system_message, 0),
+            ("user_query", f"User: {user_query}", 0, user_query, 3),  # "User: " prefix
+        ]
         
         # Priority 1 & 2: Conversation history (recent = priority 1, older = priority 2)
         if conversation_history:
@@ -94,52 +135,54 @@ class ContextQueryBuilder:
                 # Recent messages (last 3) get priority 1, others get priority 2
                 priority = 1 if idx >= (history_count - 3) else 2
                 formatted = f"{role}: {content}"
-                
-                components.append(ContextComponent(
-                    name=f"history_{idx}",
-                    content=formatted,
-                    priority=priority,
-                    tokens=self.count_tokens(formatted)
-                ))
+                entries.append((f"history_{idx}", formatted, priority, formatted, 0))
         
         # Priority 2 & 3: Retrieved context (first 3 = priority 2, rest = priority 3)
         if retrieved_context:
             for idx, doc in enumerate(retrieved_context):
                 priority = 2 if idx < 3 else 3
-                components.append(ContextComponent(
-                    name=f"retrieval_{idx}",
-                    content=doc,
-                    priority=priority,
-                    tokens=self.count_tokens(doc)
-                ))
+                entries.append((f"retrieval_{idx}", doc, priority, doc, 0))
         
         # Priority 3: Metadata
         if metadata:
-            components.append(ContextComponent(
-                name="metadata",
-                content=metadata,
-                priority=3,
-                tokens=self.count_tokens(metadata)
-            ))
+            entries.append(("metadata", metadata, 3, metadata, 0))
+        
+        encoded = self._encode_many([entry[3] for entry in entries])
         
-        # Sort by priority, then by order (to maintain coherence within priority levels)
-        components.sort(key=lambda c: (c.priority, c.name))
+        # Bucket by priority; insertion order keeps coherence within a level,
+        # so no sort is needed
+        buckets = [[], [], [], []]
+        for (name, content, priority, counted, extra), ids in zip(entries, encoded):
+            buckets[priority].append(ContextComponent(
+                name=name,
+                content=content,
+                priority=priority,
+                tokens=len(ids) + extra,
+                # Keep ids only when they encode the content itself (for truncation)
+                token_ids=ids if counted is content else None,
+            ))
         
         # Assemble under budget
         selected = []
         total_tokens = 0
+        header_costs = dict(self._header_costs)  # popped once a section is opened
         
-        for comp in components:
-            if total_tokens + comp.tokens <= self.token_budget:
+        for comp in (c for bucket in buckets for c in bucket):
+            section = comp.name.partition("_")[0]
+            cost = comp.tokens + header_costs.get(section, 0)
+            if total_tokens + cost <= self.token_budget:
                 selected.append(comp)
-                total_tokens += comp.tokens
+                total_tokens += cost
+                header_costs.pop(section, None)
+                if total_tokens == self.token_budget:
+                    break
             else:
                 # Try to fit partial content if priority 0 (critical)
                 if comp.priority == 0:
                     # Must fit somehow - truncate if needed
                     remaining = self.token_budget - total_tokens
                     if remaining > 50:  # Minimum useful tokens
-                        truncated = self._truncate_to_tokens(comp.content, remaining)
+                        truncated = self._truncate_to_tokens(comp.content, remaining, comp.token_ids)
                         selected.append(ContextComponent(
                             name=comp.name,
                             content=truncated,
@@ -149,8 +192,10 @@ class ContextQueryBuilder:
                         total_tokens += remaining
                 break
         
-        # Assemble final context
-        final_context = self._format_context(selected)
+        # Assemble final context (as text, and as token ids from the cache)
+        parts = self._context_parts(selected)
+        final_context = "\n".join(parts)
+        token_ids = self._format_tokens(parts)
         
         # Stats
         stats = {
@@ -158,30 +203,59 @@ class ContextQueryBuilder:
             "budget": self.token_budget,
             "utilization": (total_tokens / self.token_budget) * 100,
             "components_included": len(selected),
-            "components_total": len(components),
-            "latency_ms": (time.time() - start_time) * 1000
+            "components_total": len(entries),
+            "latency_ms": (time.time() - start_time) * 1000,
+            "token_ids": token_ids,
         }
         
         return final_context, stats
     
-    def _truncate_to_tokens(self, text: str, max_tokens: int) -> str:
-        """Truncate text to fit within token budget"""
-        tokens = self.tokenizer.encode(text)
+    def _truncate_to_tokens(
+        self, text: str, max_tokens: int, tokens: Optional[List[int]] = None
+    ) -> str:
+        """Truncate text to fit within token budget (pass tokens to skip re-encoding)"""
+        if tokens is None:
+            # Encode only a prefix long enough for max_tokens (~4 chars/token),
+            # growing it by the observed chars/token ratio if it falls short
+            cut = max_tokens * 4
+            while True:
+                tokens = self.tokenizer.encode(text[:cut])
+                if len(tokens) > max_tokens or cut >= len(text):
+                    break
+                cut = max(int(cut * 1.1 * max_tokens / max(len(tokens), 1)), cut + 1)
         if len(tokens) <= max_tokens:
             return text
         truncated_tokens = tokens[:max_tokens]
         return self.tokenizer.decode(truncated_tokens) + "..."
     
-    def _format_context(self, components: List[ContextComponent]) -> str:
-        """Format selected components into final context"""
+    def _format_tokens(self, parts: List[str]) -> List[int]:
+        """
+        Token ids for "\n".join(parts), built from per-part cached encodings.
+        
+        Parts are encoded separately, so ids at part boundaries may differ
+        slightly from encoding the joined string in one go.
+        """
+        token_ids: List[int] = []
+        for idx, ids in enumerate(self._encode_many(parts)):
+            if idx:
+                token_ids.extend(self._newline_ids)
+            token_ids.extend(ids)
+        return token_ids
+    
+    def _context_parts(self, components: List[ContextComponent]) -> List[str]:
+        """Ordered text parts (sections and headers) of the final context"""
         parts = []
         
-        # Group by type for better formatting
-        system_parts = [c for c in components if c.name == "system"]
-        history_parts = [c for c in components if c.name.startswith("history_")]
-        retrieval_parts = [c for c in components if c.name.startswith("retrieval_")]
-        query_parts = [c for c in components if c.name == "user_query"]
-        metadata_parts = [c for c in components if c.name == "metadata"]
+        # Group by type for better formatting (one pass)
+        # ("history_3" -> "history", "user_query" -> "user")
+        groups = {"system": [], "history": [], "retrieval": [], "user": [], "metadata": []}
+        for comp in components:
+            groups[comp.name.partition("_")[0]].append(comp)
+        system_parts = groups["system"]
+        history_parts = groups["history"]
+        retrieval_parts = groups["retrieval"]
+        query_parts = groups["user"]
+        metadata_parts = groups["metadata"]
         
         # System
         for comp in system_parts:
@@ -189,17 +263,19 @@ class ContextQueryBuilder:
         
         # Retrieved context
         if retrieval_parts:
-            parts.append("\n=== Retrieved Context ===")
+            header, footer = SECTION_HEADERS["retrieval"]
+            parts.append(header)
             for comp in retrieval_parts:
                 parts.append(comp.content)
-            parts.append("=== End Retrieved Context ===\n")
+            parts.append(footer)
         
         # Conversation history
         if history_parts:
-            parts.append("\n=== Conversation History ===")
+            header, footer = SECTION_HEADERS["history"]
+            parts.append(header)
             for comp in history_parts:
                 parts.append(comp.content)
-            parts.append("=== End History ===\n")
+            parts.append(footer)
         
         # Metadata
         for comp in metadata_parts:
@@ -209,4 +285,4 @@ class ContextQueryBuilder:
         for comp in query_parts:
             parts.append(f"\n{comp.content}")
         
-        return "\n".join(parts)
+        return parts
@@ -148,10 +148,8 @@ class MultiTenantSupportScenario(BaseScenario):
                         alpha=0.5
                     )
                 
-                results_list = [{"id": r.id, "score": r.score} for r in results]
-                
-                ndcg = self.compute_ndcg(results_list, ground_truth, k=10)
-                recall = self.compute_recall(results_list, ground_truth, k=10)
+                ndcg = self.compute_ndcg(results, ground_truth, k=10)
+                recall = self.compute_recall(results, ground_truth, k=10)
                 
                 ndcg_scores.append(ndcg)
                 recall_scores.append(recall)
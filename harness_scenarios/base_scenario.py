@@ -5,6 +5,7 @@ All scenarios inherit from this base class.
 """
 
 from abc import ABC, abstractmethod
+from array import array
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 import time
@@ -45,7 +46,7 @@ class ScenarioMetrics:
     conflict_rate: Optional[float] = None  # #12
     
     # Performance Metrics (scored)
-    latencies: Dict[str, List[float]] = field(default_factory=lambda: {})  # #13-16
+    latencies: Dict[str, array] = field(default_factory=lambda: {})  # #13-16, unboxed float64 samples
     throughput_ops_per_sec: Optional[float] = None  # #17
     
     # Operational Metrics (scored)
@@ -64,7 +65,7 @@ class ScenarioMetrics:
     def add_latency(self, op_type: str, duration_ms: float):
         """Record operation latency."""
         if op_type not in self.latencies:
-            self.latencies[op_type] = []
+            self.latencies[op_type] = array("d")
         self.latencies[op_type].append(duration_ms)
     
     def track_llm_call(self, tokens: int = 0):
@@ -90,7 +91,7 @@ class ScenarioMetrics:
         if op_type not in self.latencies or not self.latencies[op_type]:
             return None
         import numpy as np
-        return float(np.percentile(self.latencies[op_type], 95))
+        return float(np.percentile(np.frombuffer(self.latencies[op_type]), 95))
     
     def compute_avg_ndcg(self) -> Optional[float]:
         """Compute average NDCG@10."""
@@ -203,11 +204,11 @@ class BaseScenario(ABC):
     
     def compute_ndcg(
         self, 
-        results: List[Dict[str, Any]], 
+        results: List[Any], 
         ground_truth: List[str],
         k: int = 10
     ) -> float:
-        """Compute NDCG@k."""
+        """Compute NDCG@k (results may be SDK hits or ``{"id": ...}`` dicts)."""
         if not results or not ground_truth:
             return 0.0
         
@@ -216,7 +217,7 @@ class BaseScenario(ABC):
         # Build relevance scores
         relevance = []
         for i, result in enumerate(results[:k]):
-            doc_id = result.get("id")
+            doc_id = result_id(result)
             relevance.append(1.0 if doc_id in ground_truth else 0.0)
         
         # DCG
@@ -230,15 +231,15 @@ class BaseScenario(ABC):
     
     def compute_recall(
         self,
-        results: List[Dict[str, Any]],
+        results: List[Any],
         ground_truth: List[str],
         k: int = 10
     ) -> float:
-        """Compute Recall@k."""
+        """Compute Recall@k (results may be SDK hits or ``{"id": ...}`` dicts)."""
         if not ground_truth:
             return 0.0
         
-        retrieved = set(r.get("id") for r in results[:k])
+        retrieved = set(result_id(r) for r in results[:k])
         relevant = set(ground_truth)
         
         hits = len(retrieved & relevant)
@@ -253,6 +254,11 @@ class BaseScenario(ABC):
         return _TimeTracker(self.metrics, op_type)
 
 
+def result_id(result: Any) -> Any:
+    """Id of a search hit: SDK result objects expose ``.id``, dicts use ``["id"]``."""
+    return result.get("id") if isinstance(result, dict) else result.id
+
+
 class _TimeTracker:
     """Helper class for timing operations."""
     
@@ -16,7 +16,7 @@ import os
 import shutil
 import sys
 import time
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
@@ -74,6 +74,11 @@ def load_scenario(scenario_id: str, db, generator, llm_client) -> BaseScenario:
         return None
 
 
+def _p95_of_chunks(chunks: List[np.ndarray]) -> np.float64:
+    """p95 over one op type's per-scenario latency arrays (unboxed NumPy scalar)."""
+    return np.percentile(np.concatenate(chunks), 95)
+
+
 class ScorecardAggregator:
     """Aggregates metrics and produces final scorecard."""
     
@@ -84,40 +89,48 @@ class ScorecardAggregator:
     def generate_scorecard(self) -> Dict:
         """Generate comprehensive scorecard."""
         scenario_scores = {}
+        all_latencies: Dict[str, List[np.ndarray]] = {}
+        total_llm_calls = 0
+        total_llm_tokens = 0
+        passed_scenarios = 0
+        failed_checks = []
         
+        # One pass: scores, latency chunks, LLM usage, pass count and failed checks
         for scenario_id, metrics in self.scenarios.items():
             scenario_scores[scenario_id] = {
                 "pass": metrics.passed,
                 "metrics": metrics.to_dict()
             }
-        
-        # Compute global metrics
-        all_latencies = defaultdict(list)
-        total_llm_calls = 0
-        total_llm_tokens = 0
-        
-        for metrics in self.scenarios.values():
             for op_type, latencies in metrics.latencies.items():
-                all_latencies[op_type].extend(latencies)
+                if latencies:
+                    # Zero-copy float64 view of the scenario's typed buffer
+                    chunks = all_latencies.get(op_type)
+                    if chunks is None:
+                        all_latencies[op_type] = chunks = []
+                    chunks.append(np.frombuffer(latencies))
             total_llm_calls += metrics.llm_calls
             total_llm_tokens += metrics.llm_tokens
+            if metrics.passed:
+                passed_scenarios += 1
+            else:
+                failed_checks.extend([f"{scenario_id}: {err}" for err in metrics.errors])
         
-        p95_latencies = {}
-        for op_type, latencies in all_latencies.items():
-            if latencies:
-                p95_latencies[op_type] = float(np.percentile(latencies, 95))
+        # Compute global metrics
+        # Op types are independent and NumPy releases the GIL while
+        # partitioning, so spread them over threads once there are enough
+        if len(all_latencies) >= 4:
+            with ThreadPoolExecutor(max_workers=min(8, len(all_latencies))) as pool:
+                p95_values = list(pool.map(_p95_of_chunks, all_latencies.values()))
+        else:
+            p95_values = [_p95_of_chunks(chunks) for chunks in all_latencies.values()]
+        # One C-level conversion to native floats for the whole batch
+        p95_latencies = dict(zip(all_latencies, np.array(p95_values, dtype=np.float64).tolist()))
         
         # Compute overall pass/fail
         total_scenarios = len(self.scenarios)
-        passed_scenarios = sum(1 for m in self.scenarios.values() if m.passed)
         overall_pass = passed_scenarios == total_scenarios
         score = (passed_scenarios / total_scenarios * 100) if total_scenarios > 0 else 0.0
         
-        failed_checks = []
-        for scenario_id, metrics in self.scenarios.items():
-            if not metrics.passed:
-                failed_checks.extend([f"{scenario_id}: {err}" for err in metrics.errors])
-        
         scorecard = {
             "run_meta": self.run_meta,
             "scenario_scores": scenario_scores,
@@ -141,46 +154,55 @@ class ScorecardAggregator:
         return scorecard
     
     def print_summary_table(self, scorecard: Dict):
-        """Print summary table."""
-        print(f"\n{'='*80}")
-        print(f"SCORECARD SUMMARY (Real LLM Mode)")
-        print(f"{'='*80}\n")
-        
-        print(f"Run Meta:")
-        print(f"  Seed: {scorecard['run_meta']['seed']}")
-        print(f"  Scale: {scorecard['run_meta']['scale']}")
-        print(f"  Mode: {scorecard['run_meta']['mode']}")
-        print(f"  Duration: {scorecard['run_meta']['duration_s']:.2f}s")
-        
-        print(f"\nOverall Score: {scorecard['overall']['score_0_100']:.1f}/100")
-        print(f"  Passed: {scorecard['overall']['passed_scenarios']}/{scorecard['overall']['total_scenarios']}")
-        print(f"  Status: {'✓ PASS' if scorecard['overall']['pass'] else '✗ FAIL'}")
-        
-        print(f"\nLLM Usage:")
+        """Print summary table (buffered, written to stdout in one call)."""
+        run_meta = scorecard['run_meta']
+        overall = scorecard['overall']
         llm_usage = scorecard['global_metrics']['llm_usage']
-        print(f"  Total API calls: {llm_usage['total_calls']}")
-        print(f"  Total tokens: {llm_usage['total_tokens']:,}")
+        row = "{:<40} {:<10} {:<12} {:<10}\n".format
         
-        print(f"\n{'Scenario':<40} {'Status':<10} {'LLM Calls':<12} {'Tokens':<10}")
-        print(f"{'-'*72}")
+        out = [
+            f"\n{'='*80}\n",
+            f"SCORECARD SUMMARY (Real LLM Mode)\n",
+            f"{'='*80}\n\n",
+            f"Run Meta:\n",
+            f"  Seed: {run_meta['seed']}\n",
+            f"  Scale: {run_meta['scale']}\n",
+            f"  Mode: {run_meta['mode']}\n",
+            f"  Duration: {run_meta['duration_s']:.2f}s\n",
+            f"\nOverall Score: {overall['score_0_100']:.1f}/100\n",
+            f"  Passed: {overall['passed_scenarios']}/{overall['total_scenarios']}\n",
+            f"  Status: {'✓ PASS' if overall['pass'] else '✗ FAIL'}\n",
+            f"\nLLM Usage:\n",
+            f"  Total API calls: {llm_usage['total_calls']}\n",
+            f"  Total tokens: {llm_usage['total_tokens']:,}\n",
+            "\n" + row('Scenario', 'Status', 'LLM Calls', 'Tokens'),
+            f"{'-'*72}\n",
+        ]
         
-        for scenario_id, score in scorecard['scenario_scores'].items():
-            status = '✓ PASS' if score['pass'] else '✗ FAIL'
-            llm_calls = score['metrics']['llm']['calls']
-            llm_tokens = score['metrics']['llm']['tokens']
-            
-            print(f"{scenario_id:<40} {status:<10} {llm_calls:<12} {llm_tokens:<10}")
+        out.extend(
+            row(
+                scenario_id,
+                '✓ PASS' if score['pass'] else '✗ FAIL',
+                score['metrics']['llm']['calls'],
+                score['metrics']['llm']['tokens'],
+            )
+            for scenario_id, score in scorecard['scenario_scores'].items()
+        )
         
-        if scorecard['overall']['failed_checks']:
-            print(f"\nFailed Checks:")
-            for check in scorecard['overall']['failed_checks']:
-                print(f"  ✗ {check}")
+        failed_checks = overall['failed_checks']
+        if failed_checks:
+            out.append(f"\nFailed Checks:\n")
+            out.extend(f"  ✗ {check}\n" for check in failed_checks)
         
-        print(f"\nGlobal P95 Latencies (ms):")
-        for op_type, latency in scorecard['global_metrics']['p95_latency_ms'].items():
-            print(f"  {op_type}: {latency:.2f}ms")
+        out.append(f"\nGlobal P95 Latencies (ms):\n")
+        out.extend(
+            f"  {op_type}: {latency:.2f}ms\n"
+            for op_type, latency in scorecard['global_metrics']['p95_latency_ms'].items()
+        )
         
-        print(f"\n{'='*80}\n")
+        out.append(f"\n{'='*80}\n\n")
+        sys.stdout.writelines(out)
+        sys.stdout.flush()
 
 
 def main():
@@ -296,8 +318,7 @@ def main():
     
     # Save scorecard
     output_path = Path(args.output)
-    with open(output_path, "w") as f:
-        json.dump(scorecard, f, indent=2)
+    output_path.write_text(json.dumps(scorecard, indent=2))
     
     print(f"\n✓ Scorecard saved to: {output_path}")
     
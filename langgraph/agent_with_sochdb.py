@@ -1,6 +1,7 @@
 import os
 import uuid
 import asyncio
+import functools
 from typing import Annotated, Literal, TypedDict
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage
 from langchain_core.tools import tool
@@ -44,6 +45,7 @@ def save_memory(content: str) -> str:
 tools = [recall_memory, save_memory]
 tool_node = ToolNode(tools)
 
+@functools.lru_cache(maxsize=1)
 def get_model():
     config = get_azure_config()
     return AzureChatOpenAI(